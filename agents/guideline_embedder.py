@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 from typing import Dict, List
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -11,7 +12,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from langgraph.graph import StateGraph, END
 
 from utils.pdf_embedder import embed_pdf_documents
-from utils.vector_db import VectorDBManager
+from utils.vector_db import get_manager
 
 # 상태 클래스 정의
 class EmbeddingAgentState(BaseModel):
@@ -54,7 +55,7 @@ def embedding_checker(state: EmbeddingAgentState) -> EmbeddingAgentState:
     
     # VectorDB에서 직접 확인
     try:
-        db_manager = VectorDBManager()
+        db_manager = get_manager()
         collection_name = "ethics_guidelines"
         
         if db_manager.collection_exists(collection_name):
@@ -226,5 +227,9 @@ def run_embedding_agent() -> Dict:
         "error_message": result.get("error_message", None)
     }
 
+async def arun_embedding_agent() -> Dict:
+    """가이드라인 임베딩 에이전트를 별도 스레드에서 실행 (다른 단계와 동시 실행용)"""
+    return await asyncio.to_thread(run_embedding_agent)
+
 if __name__ == "__main__":
     run_embedding_agent()
\ No newline at end of file
@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 from langgraph.graph import StateGraph, END
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
-from utils.vector_db import VectorDBManager
+from utils.vector_db import get_manager
 
 # 상태 클래스 정의
 class ImprovementSuggesterState(BaseModel):
@@ -95,7 +95,7 @@ def retrieve_best_practices(state: ImprovementSuggesterState) -> ImprovementSugg
         
         # 벡터 DB에서 관련 모범 사례 검색
         best_practices = {}
-        db_manager = VectorDBManager()
+        db_manager = get_manager()
         
         for item in selected_items:
             category = item.get("category", "")
@@ -226,7 +226,7 @@ def generate_improvement_plan(state: ImprovementSuggesterState) -> ImprovementSu
         doc_id = f"improvement_plan_{datetime.now().strftime('%Y%m%d%H%M%S')}"
         
         # ChromaDB에 저장
-        db_manager = VectorDBManager()
+        db_manager = get_manager()
         saved_id = db_manager.add_document(
             collection_name="improvement_plans",
             content=json.dumps(improvement_plan, ensure_ascii=False),
@@ -1,4 +1,7 @@
-from typing import Dict, List, Any, Optional
+import atexit
+import threading
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_openai import ChatOpenAI
@@ -8,9 +11,12 @@ import json
 from datetime import datetime
 from pydantic import BaseModel, Field
 from langchain_chroma import Chroma
-from langchain_huggingface import HuggingFaceEmbeddings
 from dotenv import load_dotenv
 
+from utils import json_utils
+from utils.embeddings import get_hf_embeddings
+from utils.vector_db import get_chroma_client, invalidate_search_cache
+
 load_dotenv()
 
 # 상태 정의
@@ -32,7 +38,7 @@ class EthicalRiskState(BaseModel):
     assessment_status: str = "pending"
     retry_count: int = 0
     next_node: Optional[str] = None
-    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
+    timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())  # 그래프 실행 시각 (노드에서 재사용)
     error_message: Optional[str] = None
     
     # ChromaDB 연결 정보
@@ -63,36 +69,234 @@ llm = ChatOpenAI(
     temperature=0.2
 )
 
-# ChromaDB 연결 설정
+# 5대 윤리 차원
+CATEGORIES = ("공정성", "프라이버시", "투명성", "책임성", "안전성")
+
+# 재진단 대상이 되는 위험 등급
+HIGH_RISK_LEVELS = frozenset({"높음", "심각"})
+
+# 프롬프트에 포함할 가이드라인 본문 최대 길이 (입력 토큰 절감)
+GUIDELINE_CONTENT_LIMIT = 500
+
+# 프롬프트 템플릿 (모듈 로드 시 한 번만 생성)
+SCORE_SYSTEM_PROMPT = """
+당신은 AI 윤리 평가 전문가입니다. 제공된 리스크 항목에 대해 해당 차원의 1~5점 척도에 따라 
+점수를 평가하고, 2문장 이내의 간결한 근거를 작성해주세요.
+
+각 윤리 차원별 평가 기준:
+1) 공정성(Fairness): 성별·연령·장애·지역·인종·종교 등 개인 특성에 따른 편향과 차별 최소화
+- 1점: 편향 여부 평가 프로세스 전혀 없음
+- 2점: 기본적 인식 있으나 실질적 조치 부재
+- 3점: 일부 데이터 검증 있으나 체계적이지 않음
+- 4점: 체계적 편향 평가와 일부 집단 간 성능 차이 모니터링
+- 5점: 데이터·모델 평가 시 주요 집단 간 성능 차이 2% 미만
+
+2) 프라이버시(Privacy): 개인정보 보호를 위한 사전 프라이버시 영향평가(PIA) 및 암호화·익명화 조치 적용
+- 1점: PIA 미실시 및 비식별화 절차 부재
+- 2점: 기초적 개인정보 식별 조치만 존재
+- 3점: 부분적 PIA 및 일부 암호화 조치
+- 4점: 체계적 PIA와 대부분의 데이터 암호화
+- 5점: 전수 PIA 수행 및 암호화·접근 통제 체계 완전 구축
+
+3) 투명성(Transparency): 의사결정 근거와 처리 과정을 이해관계자가 확인할 수 있는 설명 가능성 보장
+- 1점: 결과의 근거를 전혀 제공하지 않음
+- 2점: 최소한의 결과 설명만 제공
+- 3점: 부분적 설명 및 일부 의사결정 과정 공개
+- 4점: 상세한 설명과 주요 의사결정 과정 공개
+- 5점: 모델 로직·데이터 출처 문서화로 사용자 질의 응답 가능
+
+4) 책임성(Accountability): 윤리적 문제에 대한 책임 부담 및 독립 감사·보고 체계 마련
+- 1점: 책임 주체 및 절차 전무
+- 2점: 기본적 담당자 지정만 있음
+- 3점: 부분적 책임 체계와 간헐적 검토
+- 4점: 명확한 책임 체계와 정기적 내부 검토
+- 5점: 정기적 윤리영향평가·외부 감사를 통한 거버넌스 완전 작동
+
+5) 안전성(Safety & Robustness): 예기치 않은 오류·공격으로부터 안정성 유지를 위한 취약점 분석과 대응 절차 구축
+- 1점: 취약점 진단·모니터링 전무
+- 2점: 기본적 보안 점검만 시행
+- 3점: 주기적 취약점 분석 및 기본 대응책
+- 4점: 포괄적 취약점 분석 및 체계적 대응 절차
+- 5점: 위협 시나리오 테스트, 실시간 모니터링, 자동 대응 체계 완비
+
+출력은 다음 JSON 형식을 따라야 합니다:
+```json
+{
+    "score": 3,
+    "rationale": "평가 근거를 간결하게 작성"
+}
+```
+"""
+
+SCORE_HUMAN_TEMPLATE = """
+## 리스크 항목
+- ID: {id}
+- 차원: {dimension}
+- 제목: {title}
+- 설명: {description}
+
+## 관련 가이드라인
+{guidelines}
+
+위 리스크 항목에 대해 1~5점 척도로 점수를 평가하고 근거를 제시해주세요.
+"""
+
+ASSESSMENT_PROMPT_TEMPLATE = """
+당신은 AI 윤리 전문가입니다. 주어진 AI 서비스에 대해 "{category}" 측면의 윤리적 리스크를 평가해주세요.
+
+## AI 서비스 정보
+```json
+{service_info}
+```
+
+## 관련 윤리 가이드라인
+{guidelines}
+
+## 지시사항
+1. "{category}" 측면에서 이 서비스의 주요 윤리적 리스크를 3-5가지 식별하세요.
+2. 각 리스크의 심각도를 '낮음', '중간', '높음', '심각' 중 하나로 평가하세요.
+3. 각 리스크에 대한 근거와 예방/완화 방안을 제안하세요.
+4. 1-5점 척도로 이 차원의 전반적인 윤리적 위험 점수를 매기세요.
+
+다음 JSON 형식으로 결과를 반환하세요:
+```json
+{{
+    "dimension": "{category}",
+    "risks": [
+        {{
+            "title": "리스크 제목",
+            "severity": "중간",
+            "description": "리스크 설명",
+            "evidence": "근거",
+            "mitigation": "완화 방안"
+        }}
+    ],
+    "overall_score": 3,
+    "rationale": "전반적인 점수에 대한 근거"
+}}
+```
+"""
+
+
+# ChromaDB 연결 설정 (임베딩 모델과 연결은 한 번만 만들어 재사용)
+@lru_cache(maxsize=None)
 def get_vector_store():
     """ChromaDB 벡터 스토어 연결"""
-    embedding_function = HuggingFaceEmbeddings(model_name="nlpai-lab/KURE-v1")
+    embedding_function = get_hf_embeddings()
     vector_store = Chroma(
-        persist_directory="./vector_store",
+        client=get_chroma_client("./vector_store"),
         embedding_function=embedding_function,
         collection_name="ethics_guidelines"  # 콜렉션명 명시
     )
     return vector_store
 
 
+# ChromaDB 쓰기는 버퍼에 모아 백그라운드 스레드에서 배치 단위로 저장
+_FLUSH_BATCH_SIZE = 64
+_FLUSH_INTERVAL = 5.0
+
+_pending_writes: List[Tuple[str, Dict[str, Any]]] = []
+_pending_lock = threading.Lock()
+_flush_requested = threading.Event()
+_flush_stop = threading.Event()
+_flush_thread: Optional[threading.Thread] = None
+
+
+def _flush_pending_writes() -> None:
+    """버퍼에 쌓인 텍스트를 한 번의 add_texts 호출로 저장"""
+    with _pending_lock:
+        batch = _pending_writes[:]
+        _pending_writes.clear()
+    
+    if not batch:
+        return
+    
+    try:
+        get_vector_store().add_texts(
+            texts=[text for text, _ in batch],
+            metadatas=[metadata for _, metadata in batch]
+        )
+        invalidate_search_cache("ethics_guidelines")
+    except Exception as e:
+        print(f"⚠️ 벡터 스토어 저장 실패 ({len(batch)}건): {str(e)}")
+
+
+def _flush_loop() -> None:
+    """배치 크기에 도달하거나 주기가 지나면 버퍼를 비움"""
+    while not _flush_stop.is_set():
+        _flush_requested.wait(_FLUSH_INTERVAL)
+        _flush_requested.clear()
+        _flush_pending_writes()
+
+
+def _buffer_write(text: str, metadata: Dict[str, Any]) -> None:
+    """벡터 스토어에 저장할 텍스트를 버퍼에 추가"""
+    global _flush_thread
+    
+    with _pending_lock:
+        _pending_writes.append((text, metadata))
+        if len(_pending_writes) >= _FLUSH_BATCH_SIZE:
+            _flush_requested.set()
+        
+        if _flush_thread is None:
+            _flush_thread = threading.Thread(target=_flush_loop, daemon=True)
+            _flush_thread.start()
+
+
+@atexit.register
+def _shutdown_persistence() -> None:
+    """프로세스 종료 시 남은 쓰기를 모두 저장"""
+    _flush_stop.set()
+    _flush_requested.set()
+    if _flush_thread is not None:
+        _flush_thread.join()
+    _flush_pending_writes()
+
+
+# 스트리밍 응답 최대 길이 (초과 시 더 기다리지 않음)
+_STREAM_MAX_CHARS = 2048
+
+
+def _stream_json_response(messages: List[Any]) -> str:
+    """
+    LLM 응답을 스트리밍으로 받아 첫 JSON 객체가 완성되는 즉시 반환합니다.
+    JSON 이후에 덧붙는 설명 텍스트는 생성을 기다리지 않습니다.
+    """
+    buffer = ""
+    for chunk in llm.stream(messages):
+        buffer += chunk.content
+        
+        # 닫는 괄호가 들어온 경우에만 파싱 시도
+        if "}" in chunk.content:
+            start = buffer.find("{")
+            end = buffer.rfind("}")
+            if 0 <= start < end:
+                candidate = buffer[start:end + 1]
+                try:
+                    json_utils.loads(candidate)
+                    return candidate
+                except ValueError:
+                    pass
+        
+        if len(buffer) > _STREAM_MAX_CHARS:
+            break
+    
+    return buffer
+
+
 # 가이드라인 검색 노드
 def guideline_retriever(state: EthicalRiskState) -> EthicalRiskState:
     """
-    AI 윤리 가이드라인을 검색하여 5대 윤리 차원별로 요약합니다.
+    AI 윤리 가이드라인을 검색하여 5대 윤리 차원별로 정리합니다.
     """
     try:
         # 벡터 스토어 연결
         vector_store = get_vector_store()
         
-        # 5대 윤리 차원
-        ethic_dimensions = [
-            "공정성", "프라이버시", "투명성", "책임성", "안전성"
-        ]
-        
         guideline_summary = {}
         
         # 각 차원별로 관련 가이드라인 검색
-        for dimension in ethic_dimensions:
+        for dimension in CATEGORIES:
             # 검색 쿼리 생성
             query = f"AI {dimension} 윤리 가이드라인"
             
@@ -107,48 +311,15 @@ def guideline_retriever(state: EthicalRiskState) -> EthicalRiskState:
             for doc in results:
                 guidelines.append({
                     "source": doc.metadata.get("file_name", "Unknown"),
-                    "content": doc.page_content,
+                    "content": doc.page_content[:GUIDELINE_CONTENT_LIMIT],
                     "page": doc.metadata.get("page_number", 0)
                 })
             
             guideline_summary[dimension] = guidelines
         
-        # 가이드라인 요약 생성
-        system_prompt = """
-        당신은 AI 윤리 가이드라인 전문가입니다. 각 윤리 차원(공정성, 프라이버시, 투명성, 책임성, 안전성)에 대한
-        가이드라인을 요약하고, 각 차원의 1-5점 척도 평가 기준을 표로 작성해주세요.
-        """
-        
-        human_prompt = f"""
-        다음은 5대 윤리 차원별로 검색된 가이드라인 내용입니다:
-        
-        {json.dumps(guideline_summary, ensure_ascii=False, indent=2)}
-        
-        이를 바탕으로 각 윤리 차원(공정성, 프라이버시, 투명성, 책임성, 안전성)의 주요 평가 기준을 요약하고,
-        각 차원의 1-5점 척도 평가 기준을 표로 작성해주세요.
-        """
-        
-        # LLM으로 가이드라인 요약
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=human_prompt)
-        ]
-        
-        response = llm.invoke(messages)
-        
-        # 요약 결과 저장
+        # 검색 결과를 그대로 상태에 저장 (후속 노드가 차원별 원문을 직접 사용)
         state.guideline_summary = guideline_summary
         
-        # 벡터 스토어에 요약 결과 저장
-        vector_store.add_texts(
-            texts=[response.content],
-            metadatas=[{
-                "type": "guideline_summary",
-                "timestamp": datetime.now().isoformat(),
-                "dimensions": ",".join(ethic_dimensions)
-            }]
-        )
-        
         return state
         
     except Exception as e:
@@ -164,7 +335,7 @@ def risk_item_extractor(state: EthicalRiskState) -> EthicalRiskState:
     """
     try:
         # 서비스 정보 추출
-        service_info_text = json.dumps(state.service_info, ensure_ascii=False, indent=2)
+        service_info_text = json_utils.dumps(state.service_info)
         
         # 프롬프트 템플릿 정의
         system_prompt = """
@@ -217,7 +388,7 @@ def risk_item_extractor(state: EthicalRiskState) -> EthicalRiskState:
             elif "```" in json_content:
                 json_content = json_content.split("```")[1].split("```")[0].strip()
             
-            risk_items = json.loads(json_content)
+            risk_items = json_utils.loads(json_content)
             
             # 상태 업데이트
             state.risk_items = risk_items
@@ -248,56 +419,6 @@ def score_predictor(state: EthicalRiskState) -> EthicalRiskState:
         scores = {}
         rationale = {}
         
-        # 프롬프트 템플릿 정의
-        system_prompt = """
-        당신은 AI 윤리 평가 전문가입니다. 제공된 리스크 항목에 대해 해당 차원의 1~5점 척도에 따라 
-        점수를 평가하고, 2문장 이내의 간결한 근거를 작성해주세요.
-
-        각 윤리 차원별 평가 기준:
-        1) 공정성(Fairness): 성별·연령·장애·지역·인종·종교 등 개인 특성에 따른 편향과 차별 최소화
-        - 1점: 편향 여부 평가 프로세스 전혀 없음
-        - 2점: 기본적 인식 있으나 실질적 조치 부재
-        - 3점: 일부 데이터 검증 있으나 체계적이지 않음
-        - 4점: 체계적 편향 평가와 일부 집단 간 성능 차이 모니터링
-        - 5점: 데이터·모델 평가 시 주요 집단 간 성능 차이 2% 미만
-
-        2) 프라이버시(Privacy): 개인정보 보호를 위한 사전 프라이버시 영향평가(PIA) 및 암호화·익명화 조치 적용
-        - 1점: PIA 미실시 및 비식별화 절차 부재
-        - 2점: 기초적 개인정보 식별 조치만 존재
-        - 3점: 부분적 PIA 및 일부 암호화 조치
-        - 4점: 체계적 PIA와 대부분의 데이터 암호화
-        - 5점: 전수 PIA 수행 및 암호화·접근 통제 체계 완전 구축
-
-        3) 투명성(Transparency): 의사결정 근거와 처리 과정을 이해관계자가 확인할 수 있는 설명 가능성 보장
-        - 1점: 결과의 근거를 전혀 제공하지 않음
-        - 2점: 최소한의 결과 설명만 제공
-        - 3점: 부분적 설명 및 일부 의사결정 과정 공개
-        - 4점: 상세한 설명과 주요 의사결정 과정 공개
-        - 5점: 모델 로직·데이터 출처 문서화로 사용자 질의 응답 가능
-
-        4) 책임성(Accountability): 윤리적 문제에 대한 책임 부담 및 독립 감사·보고 체계 마련
-        - 1점: 책임 주체 및 절차 전무
-        - 2점: 기본적 담당자 지정만 있음
-        - 3점: 부분적 책임 체계와 간헐적 검토
-        - 4점: 명확한 책임 체계와 정기적 내부 검토
-        - 5점: 정기적 윤리영향평가·외부 감사를 통한 거버넌스 완전 작동
-
-        5) 안전성(Safety & Robustness): 예기치 않은 오류·공격으로부터 안정성 유지를 위한 취약점 분석과 대응 절차 구축
-        - 1점: 취약점 진단·모니터링 전무
-        - 2점: 기본적 보안 점검만 시행
-        - 3점: 주기적 취약점 분석 및 기본 대응책
-        - 4점: 포괄적 취약점 분석 및 체계적 대응 절차
-        - 5점: 위협 시나리오 테스트, 실시간 모니터링, 자동 대응 체계 완비
-
-        출력은 다음 JSON 형식을 따라야 합니다:
-        ```json
-        {
-            "score": 3,
-            "rationale": "평가 근거를 간결하게 작성"
-        }
-        ```
-        """
-        
         # 각 리스크 항목에 대해 점수 평가
         for risk in risk_items:
             risk_id = risk["id"]
@@ -312,38 +433,33 @@ def score_predictor(state: EthicalRiskState) -> EthicalRiskState:
                 for item in dimension_guidelines
             ])
             
-            human_prompt = f"""
-            ## 리스크 항목
-            - ID: {risk_id}
-            - 차원: {dimension}
-            - 제목: {title}
-            - 설명: {description}
-            
-            ## 관련 가이드라인
-            {guidelines_text}
-            
-            위 리스크 항목에 대해 1~5점 척도로 점수를 평가하고 근거를 제시해주세요.
-            """
+            human_prompt = SCORE_HUMAN_TEMPLATE.format_map({
+                "id": risk_id,
+                "dimension": dimension,
+                "title": title,
+                "description": description,
+                "guidelines": guidelines_text
+            })
             
             # 메시지 생성
             messages = [
-                SystemMessage(content=system_prompt),
+                SystemMessage(content=SCORE_SYSTEM_PROMPT),
                 HumanMessage(content=human_prompt)
             ]
             
-            # LLM으로 점수 예측
-            response = llm.invoke(messages)
+            # LLM으로 점수 예측 (JSON 객체가 완성되면 스트림 조기 종료)
+            response_text = _stream_json_response(messages)
             
             # JSON 추출
             try:
                 # 응답에서 JSON 부분만 추출
-                json_content = response.content
+                json_content = response_text
                 if "```json" in json_content:
                     json_content = json_content.split("```json")[1].split("```")[0].strip()
                 elif "```" in json_content:
                     json_content = json_content.split("```")[1].split("```")[0].strip()
                 
-                result = json.loads(json_content)
+                result = json_utils.loads(json_content)
                 
                 # 결과 저장
                 scores[risk_id] = result["score"]
@@ -460,6 +576,7 @@ def severity_classifier(state: EthicalRiskState) -> EthicalRiskState:
         
         # 각 리스크 항목의 위험 등급 결정
         severity_levels = []
+        has_high_risk = False
         for risk in risk_items:
             risk_id = risk["id"]
             if risk_id in scores:
@@ -478,12 +595,16 @@ def severity_classifier(state: EthicalRiskState) -> EthicalRiskState:
                     "level": level,
                     "score": score
                 })
+                
+                if level in HIGH_RISK_LEVELS:
+                    has_high_risk = True
         
         # 상태 업데이트
         state.severity_levels = severity_levels
         
-        # 전체 위험 등급 추가
+        # 전체 위험 등급 및 고위험 항목 존재 여부 추가
         state.risk_scores["overall_level"] = overall_level
+        state.risk_scores["has_high_risk"] = has_high_risk
         
         return state
         
@@ -499,12 +620,9 @@ def loop_controller(state: EthicalRiskState) -> EthicalRiskState:
     리스크 심각도에 따라 재진단 여부를 결정합니다.
     """
     try:
-        # 위험 등급 및 재시도 횟수 확인
-        severity_levels = state.severity_levels
+        # 재시도 횟수 및 고위험 항목 확인 (severity_classifier에서 계산)
         retry_count = state.retry_count
-        
-        # 고위험 항목 확인
-        high_risk_exists = any(item["level"] in ["높음", "심각"] for item in severity_levels)
+        high_risk_exists = state.risk_scores.get("has_high_risk", False)
         
         # 다음 노드 결정
         if high_risk_exists and retry_count < 3:
@@ -523,23 +641,19 @@ def loop_controller(state: EthicalRiskState) -> EthicalRiskState:
             "severity_levels": state.severity_levels,
             "retry_count": state.retry_count,
             "next_node": state.next_node,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": state.timestamp
         }
         
         # 상태 업데이트
         state.risk_assessments.append(risk_summary)
         
-        # ChromaDB에 결과 저장
-        vector_store = get_vector_store()
-        vector_store.add_texts(
-            texts=[json.dumps(risk_summary, ensure_ascii=False, indent=2)],
-            metadatas=[{
-                "type": "risk_assessment",
-                "service_id": state.service_info.get("id", "unknown"),
-                "timestamp": datetime.now().isoformat(),
-                "overall_level": state.risk_scores.get("overall_level", "unknown")
-            }]
-        )
+        # ChromaDB에 결과 저장 (백그라운드)
+        _buffer_write(json_utils.dumps(risk_summary), {
+            "type": "risk_assessment",
+            "service_id": state.service_info.get("id", "unknown"),
+            "timestamp": state.timestamp,
+            "overall_level": state.risk_scores.get("overall_level", "unknown")
+        })
         
         return state
         
@@ -558,13 +672,13 @@ def risk_assessor(state: EthicalRiskState) -> EthicalRiskState:
         print("🔍 윤리적 리스크 평가 시작...")
         
         # 서비스 정보 추출
-        service_info_text = json.dumps(state.service_info, ensure_ascii=False, indent=2)
+        service_info_text = json_utils.dumps(state.service_info)
         
         # 결과 저장용 리스트
         risk_assessments = []
         
         # 각 윤리 차원별 평가
-        for category in ["공정성", "프라이버시", "투명성", "책임성", "안전성"]:
+        for category in CATEGORIES:
             print(f"  - {category} 카테고리 평가 중...")
             
             # 해당 차원의 가이드라인 추출
@@ -603,57 +717,19 @@ def risk_assessor(state: EthicalRiskState) -> EthicalRiskState:
                 # 생성된 가이드라인 사용
                 guidelines_text = f"[LLM 생성 가이드라인] {category} 윤리 기준:\n\n{generated_response.content}"
                 
-                # 벡터 스토어에 생성된 가이드라인 저장
-                try:
-                    vector_store = get_vector_store()
-                    vector_store.add_texts(
-                        texts=[generated_response.content],
-                        metadatas=[{
-                            "type": "generated_guideline",
-                            "dimension": category,
-                            "timestamp": datetime.now().isoformat()
-                        }]
-                    )
-                    print(f"  ✓ 생성된 {category} 가이드라인 벡터 스토어에 저장 완료")
-                except Exception as e:
-                    print(f"  ⚠️ 생성된 가이드라인 저장 실패: {str(e)}")
+                # 벡터 스토어에 생성된 가이드라인 저장 (배치 버퍼)
+                _buffer_write(generated_response.content, {
+                    "type": "generated_guideline",
+                    "dimension": category,
+                    "timestamp": state.timestamp
+                })
             
             # LLM으로 리스크 평가
-            assessment_prompt = f"""
-                        당신은 AI 윤리 전문가입니다. 주어진 AI 서비스에 대해 "{category}" 측면의 윤리적 리스크를 평가해주세요.
-                        
-                        ## AI 서비스 정보
-                        ```json
-                        {service_info_text}
-                        ```
-                        
-                        ## 관련 윤리 가이드라인
-                        {guidelines_text}
-                        
-                        ## 지시사항
-                        1. "{category}" 측면에서 이 서비스의 주요 윤리적 리스크를 3-5가지 식별하세요.
-                        2. 각 리스크의 심각도를 '낮음', '중간', '높음', '심각' 중 하나로 평가하세요.
-                        3. 각 리스크에 대한 근거와 예방/완화 방안을 제안하세요.
-                        4. 1-5점 척도로 이 차원의 전반적인 윤리적 위험 점수를 매기세요.
-                        
-                        다음 JSON 형식으로 결과를 반환하세요:
-                        ```json
-                        {{
-                            "dimension": "{category}",
-                            "risks": [
-                                {{
-                                    "title": "리스크 제목",
-                                    "severity": "중간",
-                                    "description": "리스크 설명",
-                                    "evidence": "근거",
-                                    "mitigation": "완화 방안"
-                                }}
-                            ],
-                            "overall_score": 3,
-                            "rationale": "전반적인 점수에 대한 근거"
-                        }}
-                        ```
-                        """
+            assessment_prompt = ASSESSMENT_PROMPT_TEMPLATE.format_map({
+                "category": category,
+                "service_info": service_info_text,
+                "guidelines": guidelines_text
+            })
             
             # 메시지 생성
             messages = [
@@ -674,7 +750,7 @@ def risk_assessor(state: EthicalRiskState) -> EthicalRiskState:
                     elif "```" in json_content:
                         json_content = json_content.split("```")[1].split("```")[0].strip()
                     
-                    assessment = json.loads(json_content)
+                    assessment = json_utils.loads(json_content)
                     risk_assessments.append(assessment)
                     print(f"  ✓ {category} 평가 완료")
                     
@@ -712,11 +788,6 @@ def risk_assessor(state: EthicalRiskState) -> EthicalRiskState:
         state.assessment_status = "failed"
         print(f"❌ 윤리 리스크 평가 실패: {str(e)}")
         return state
-        
-    except Exception as e:
-        state.error_message = f"윤리 리스크 평가 중 오류 발생: {str(e)}"
-        state.assessment_status = "failed"
-        return state
 
 
 # 그래프 구성
@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+from functools import lru_cache
 from typing import Dict, List, Any
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -8,12 +9,19 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# API 키 (모듈 로드 시 한 번만 조회)
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
 # 상위 디렉토리를 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from langgraph.graph import StateGraph, END
-from utils.vector_db import VectorDBManager
+from utils.vector_db import get_manager
+from utils.llm_cache import LLMCache, FileCacheBackend, make_cache_key
+from utils.json_extract import extract_first_json
+from utils import json_utils
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import SystemMessage, HumanMessage
 
 # 상태 클래스 정의
 class ScopeValidatorState(BaseModel):
@@ -31,19 +39,45 @@ class ScopeValidatorState(BaseModel):
     timestamp: str = Field(default="", description="검증 수행 시간")
     error_message: str = Field(default="", description="오류 메시지(있는 경우)")
 
+# 범위 검증 모델 및 응답 캐시 (동일 서비스 재실행 시 API 호출 생략)
+VALIDATION_MODEL = "gpt-4o-mini"
+_validation_cache = LLMCache(FileCacheBackend("./.cache/llm/scope_validator"), ttl=24 * 60 * 60)
+
+@lru_cache(maxsize=None)
+def _llm(model: str, temperature: float) -> ChatOpenAI:
+    """모델 설정별 LLM 클라이언트를 한 번만 생성하여 재사용"""
+    return ChatOpenAI(model=model, temperature=temperature, openai_api_key=OPENAI_API_KEY)
+
+# 범위 검증 지시사항 (요청마다 동일한 프롬프트 접두부)
+VALIDATION_SYSTEM_PROMPT = """
+당신은 AI 윤리 진단 전문가입니다. 제공된 AI 서비스 정보를 가이드라인과 비교하여 진단 범위를 검증하고 필요시 수정해주세요.
+
+다음을 수행하세요:
+1. 서비스 정보가 윤리 진단에 충분한지 검토
+2. 가이드라인과 관련하여 추가해야 할 진단 범위가 있는지 확인
+3. 서비스 도메인에 특정된 윤리적 고려사항이 있는지 검토
+4. 진단 범위를 JSON 형식으로 반환 (기존 구조 유지, 필요시 필드 추가)
+5. 업데이트 내용 목록을 JSON 배열 형식으로 작성
+
+각 업데이트는 {"update_type": "added" 또는 "modified" 또는 "removed", "field": "필드명", "reason": "사유"}
+
+출력 형식:
+{"validated_scope": [수정된 서비스 정보], "scope_updates": [업데이트 내역 목록]}
+"""
+
 # 에이전트 노드: GuidlineRetriever
-def guideline_retriever(state: ScopeValidatorState) -> ScopeValidatorState:
+def guideline_retriever(state: ScopeValidatorState) -> Dict[str, Any]:
     """
     서비스 정보를 기반으로 관련 윤리 가이드라인을 검색합니다.
+    (변경된 필드만 반환하며 LangGraph가 기존 상태에 병합)
     """
     print("🔍 서비스 관련 가이드라인 검색 중...")
     
     if not state.service_info:
-        return ScopeValidatorState(
-            service_info=state.service_info,
-            validation_status="failed",
-            error_message="서비스 정보가 제공되지 않았습니다."
-        )
+        return {
+            "validation_status": "failed",
+            "error_message": "서비스 정보가 제공되지 않았습니다."
+        }
     
     # 서비스 키워드 추출
     service_title = state.service_info.get("title", "")
@@ -51,98 +85,87 @@ def guideline_retriever(state: ScopeValidatorState) -> ScopeValidatorState:
     service_domain = state.service_info.get("domain", "")
     service_summary = state.service_info.get("summary", "")
     
-    search_keywords = [
-        service_title,
-        service_domain,
-        *[feature.get("name", "") for feature in service_features],
-        "윤리", "프라이버시", "투명성", "편향성", "공정성"
-    ]
+    # 빈 키워드 제외 및 순서를 유지한 중복 제거
+    search_keywords = list(dict.fromkeys(
+        keyword.strip()
+        for keyword in [
+            service_title,
+            service_domain,
+            *[feature.get("name", "") for feature in service_features],
+            "윤리", "프라이버시", "투명성", "편향성", "공정성"
+        ]
+        if keyword and keyword.strip()
+    ))
     
     # VectorDB 검색
     try:
-        db_manager = VectorDBManager()
+        db_manager = get_manager()
         collection_name = "ethics_guidelines"
         
-        guideline_references = []
-        for keyword in search_keywords:
-            if not keyword.strip():
-                continue
-                
-            results = db_manager.search(
-                collection_name=collection_name,
-                query=keyword,
-                k=3,
-                filter={"type": "guideline"}
-            )
-            
+        # 모든 키워드를 한 번에 검색 (주요 기관 가이드라인만 DB에서 필터링)
+        results_per_keyword = db_manager.search_batch(
+            collection_name=collection_name,
+            queries=search_keywords,
+            k=2,
+            filter={"$and": [{"type": "guideline"}, {"priority": {"$lte": 2}}]}
+        )
+        
+        # 문서 ID 기준 중복 제거와 참조 생성을 한 번에 처리 (문서당 한 번만 자르기)
+        seen = {}
+        for keyword, results in zip(search_keywords, results_per_keyword):
             for result in results:
-                guideline_ref = {
+                ref_id = result.metadata.get("doc_id", "")
+                if ref_id in seen:
+                    continue
+                seen[ref_id] = {
                     "content": result.page_content[:500] + "...",
                     "metadata": result.metadata,
                     "relevance_to": keyword
                 }
-                guideline_references.append(guideline_ref)
-        
-        # 중복 제거
-        unique_refs = []
-        unique_ids = set()
         
-        for ref in guideline_references:
-            ref_id = ref["metadata"].get("doc_id", "")
-            if ref_id not in unique_ids:
-                unique_ids.add(ref_id)
-                unique_refs.append(ref)
+        unique_refs = list(seen.values())
         
         print(f"✅ {len(unique_refs)}개의 관련 가이드라인 참조를 찾았습니다.")
         
-        return ScopeValidatorState(
-            service_info=state.service_info,
-            guideline_references=unique_refs,
-        )
+        return {"guideline_references": unique_refs}
     
     except Exception as e:
         error_message = f"가이드라인 검색 중 오류 발생: {str(e)}"
         print(f"❌ {error_message}")
         
-        return ScopeValidatorState(
-            service_info=state.service_info,
-            validation_status="failed",
-            error_message=error_message
-        )
+        return {
+            "validation_status": "failed",
+            "error_message": error_message
+        }
 
 # 에이전트 노드: ScopeValidator
-def scope_validator(state: ScopeValidatorState) -> ScopeValidatorState:
+def scope_validator(state: ScopeValidatorState) -> Dict[str, Any]:
     """
     서비스 정보와 가이드라인을 비교하여 진단 범위를 검증합니다.
+    (변경된 필드만 반환하며 LangGraph가 기존 상태에 병합)
     """
     print("🔍 진단 범위 검증 중...")
     
     if not state.guideline_references:
-        return ScopeValidatorState(
-            service_info=state.service_info,
-            guideline_references=state.guideline_references,
-            validation_status="completed",
-            validated_scope=state.service_info,
-            timestamp=datetime.now().isoformat(),
-            scope_updates=[{"update_type": "no_update", "reason": "가이드라인 참조 없음"}]
-        )
+        return {
+            "validation_status": "completed",
+            "validated_scope": state.service_info,
+            "timestamp": datetime.now().isoformat(),
+            "scope_updates": [{"update_type": "no_update", "reason": "가이드라인 참조 없음"}]
+        }
 
-    # OpenAI API 키 가져오기
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    
-    if not openai_api_key:
-        return ScopeValidatorState(
-            service_info=state.service_info,
-            guideline_references=state.guideline_references,
-            validation_status="failed",
-            error_message="OpenAI API 키가 설정되지 않았습니다.",
-            timestamp=datetime.now().isoformat()
-        )
+    # OpenAI API 키 확인
+    if not OPENAI_API_KEY:
+        return {
+            "validation_status": "failed",
+            "error_message": "OpenAI API 키가 설정되지 않았습니다.",
+            "timestamp": datetime.now().isoformat()
+        }
     
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, openai_api_key=openai_api_key)
+    llm = _llm(VALIDATION_MODEL, 0)
     
     # 서비스 정보와 가이드라인 텍스트 준비
-    service_info_text = json.dumps(state.service_info, ensure_ascii=False, indent=2)
+    service_info_text = json_utils.dumps(state.service_info)
     guideline_texts = []
     
     for ref in state.guideline_references:
@@ -153,41 +176,41 @@ def scope_validator(state: ScopeValidatorState) -> ScopeValidatorState:
     
     guideline_text = "\n\n".join(guideline_texts)
     
-    # LLM으로 범위 검증
-    validation_prompt = f"""
-    당신은 AI 윤리 진단 전문가입니다. 제공된 AI 서비스 정보를 가이드라인과 비교하여 진단 범위를 검증하고 필요시 수정해주세요.
-    
-    ## AI 서비스 정보
-    ```json
-    {service_info_text}
-    ```
-    
-    ## 관련 가이드라인
-    {guideline_text}
-    
-    다음을 수행하세요:
-    1. 서비스 정보가 윤리 진단에 충분한지 검토
-    2. 가이드라인과 관련하여 추가해야 할 진단 범위가 있는지 확인
-    3. 서비스 도메인에 특정된 윤리적 고려사항이 있는지 검토
-    4. 진단 범위를 JSON 형식으로 반환 (기존 구조 유지, 필요시 필드 추가)
-    5. 업데이트 내용 목록을 JSON 배열 형식으로 작성
-    
-    각 업데이트는 {{"update_type": "added" 또는 "modified" 또는 "removed", "field": "필드명", "reason": "사유"}}
+    # 정적인 지시사항과 가이드라인을 앞에, 서비스 정보를 뒤에 배치 (프롬프트 캐싱 적중률 향상)
+    messages = [
+        SystemMessage(content=f"{VALIDATION_SYSTEM_PROMPT}\n## 관련 가이드라인\n{guideline_text}"),
+        HumanMessage(content=f"## AI 서비스 정보\n```json\n{service_info_text}\n```")
+    ]
     
-    출력 형식:
-    {{"validated_scope": [수정된 서비스 정보], "scope_updates": [업데이트 내역 목록]}}
-    """
+    # 동일한 입력에 대한 검증 결과 캐시 키 (temperature=0 호출이므로 결과 재사용 가능)
+    cache_key = make_cache_key({
+        "model": VALIDATION_MODEL,
+        "messages": [message.content for message in messages]
+    })
     
     try:
-        response = llm.invoke(validation_prompt)
-        validation_text = response.content
+        validation_data = _validation_cache.get(cache_key)
         
-        # JSON 형식 추출 (텍스트에서 JSON 부분만 추출)
-        import re
-        json_match = re.search(r'\{.*\}', validation_text, re.DOTALL)
+        if validation_data is not None:
+            print("💾 범위 검증 캐시 적중: LLM 호출 생략")
+        else:
+            response = llm.invoke(messages)
+            validation_text = response.content
+            
+            # 프롬프트 캐시 적중 토큰 수 기록
+            usage = getattr(response, "usage_metadata", None) or {}
+            cached_tokens = (usage.get("input_token_details") or {}).get("cache_read") or 0
+            if cached_tokens:
+                print(f"💾 프롬프트 캐시 적중: {cached_tokens}/{usage.get('input_tokens', 0)} 토큰")
+            
+            # JSON 형식 추출 (텍스트에서 첫 번째 JSON 객체만 추출)
+            json_text = extract_first_json(validation_text)
+            
+            if json_text:
+                validation_data = json_utils.loads(json_text)
+                _validation_cache.set(cache_key, validation_data)
         
-        if json_match:
-            validation_data = json.loads(json_match.group(0))
+        if validation_data is not None:
             validated_scope = validation_data.get("validated_scope", state.service_info)
             scope_updates = validation_data.get("scope_updates", [])
         else:
@@ -197,28 +220,24 @@ def scope_validator(state: ScopeValidatorState) -> ScopeValidatorState:
         
         print(f"✅ 진단 범위 검증 완료: {len(scope_updates)}개 업데이트")
         
-        return ScopeValidatorState(
-            service_info=state.service_info,
-            guideline_references=state.guideline_references,
-            validated_scope=validated_scope,
-            scope_updates=scope_updates,
-            validation_status="completed",
-            timestamp=datetime.now().isoformat()
-        )
+        return {
+            "validated_scope": validated_scope,
+            "scope_updates": scope_updates,
+            "validation_status": "completed",
+            "timestamp": datetime.now().isoformat()
+        }
     
     except Exception as e:
         error_message = f"범위 검증 중 오류 발생: {str(e)}"
         print(f"❌ {error_message}")
         
         # 오류 발생 시 원본 데이터 유지
-        return ScopeValidatorState(
-            service_info=state.service_info,
-            guideline_references=state.guideline_references,
-            validated_scope=state.service_info,  # 원본 유지
-            validation_status="failed",
-            error_message=error_message,
-            timestamp=datetime.now().isoformat()
-        )
+        return {
+            "validated_scope": state.service_info,  # 원본 유지
+            "validation_status": "failed",
+            "error_message": error_message,
+            "timestamp": datetime.now().isoformat()
+        }
 
 # 그래프 구성
 def create_scope_validator() -> StateGraph:
@@ -1,21 +1,36 @@
 import os
 import sys
-import json
-from typing import Dict, List, Any
+import atexit
+import asyncio
+import threading
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from uuid import uuid4
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 # .env 파일 로드
 load_dotenv()
 
+# API 키 (모듈 로드 시 한 번만 조회)
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+TAVILY_API_KEY = os.getenv("TAVILY_API_KEY")
+
 # 상위 디렉토리를 경로에 추가
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import httpx
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from utils.vector_db import VectorDBManager
+from utils.vector_db import get_manager
+from utils.llm_cache import LLMCache, FileCacheBackend, MemoryCacheBackend, make_cache_key
+from utils import json_utils
 from langchain_community.utilities.tavily_search import TavilySearchAPIWrapper
 
 # 상태 클래스 정의
@@ -36,6 +51,192 @@ class ServiceAnalysisState(BaseModel):
     error_message: str = Field(default="", description="오류 발생 시 메시지")
     timestamp: str = Field(default="", description="분석 수행 시간")
 
+# 서비스 분석 모델 및 응답/검색 캐시 (동일 서비스 재실행 시 API 호출 생략)
+ANALYSIS_MODEL = "gpt-4o-mini"
+ANALYSIS_TEMPLATE_VERSION = 2  # 프롬프트 템플릿 수정 시 올려서 기존 캐시 무효화
+_analysis_cache = LLMCache(FileCacheBackend("./.cache/llm/service_info"), ttl=24 * 60 * 60)
+
+# 웹 검색 결과는 몇 주 단위로 바뀌므로 7일간 재사용 (프로세스 내 메모리 캐시 + 디스크 캐시)
+TAVILY_CACHE_TTL = 7 * 24 * 60 * 60
+_search_memory_cache = LLMCache(MemoryCacheBackend(max_size=1024), ttl=TAVILY_CACHE_TTL)
+_search_cache = LLMCache(FileCacheBackend("./.cache/search/tavily"), ttl=TAVILY_CACHE_TTL)
+
+# 서비스 개요 문서 쓰기 버퍼 (문서 ID별 최신 내용만 유지했다가 한 번에 저장)
+SERVICE_COLLECTION = "service_info"
+_SERVICE_FLUSH_SIZE = 32
+_pending_service_docs: "OrderedDict[str, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+_pending_service_lock = threading.Lock()
+
+# 임베딩/저장은 백그라운드 스레드에서 수행하고 파이프라인 종료 시점에만 완료를 기다림
+_write_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="service-doc-writer")
+_pending_writes: List[Future] = []
+
+# 요약에 진단 범위가 없을 때 사용하는 기본 범위
+DEFAULT_ETHICAL_CONCERNS = [
+    "데이터 편향성",
+    "프라이버시 침해",
+    "투명성과 설명가능성",
+    "안전성과 신뢰성",
+    "책임성"
+]
+DEFAULT_ANALYSIS_SCOPE = [
+    "편향성 평가 및 완화 방안",
+    "개인정보 수집·이용·보호",
+    "의사결정 과정 투명성",
+    "시스템 안전성 검증",
+    "책임 소재 명확화"
+]
+
+# 연결을 재사용하는 공용 HTTP 클라이언트 (요청마다 TLS 핸드셰이크 반복 방지)
+# AsyncClient의 연결은 생성된 이벤트 루프에 묶이므로 일괄 분석마다 루프 안에서 만들고 닫음
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+_HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+_http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=30)
+_async_http_client: ContextVar[Optional[httpx.AsyncClient]] = ContextVar("_async_http_client", default=None)
+_async_chain: ContextVar[Optional[Any]] = ContextVar("_async_chain", default=None)
+
+# Tavily 요청 옵션 (동기/비동기 경로가 같은 요청을 보내고 같은 캐시 키를 쓰도록 공유)
+TAVILY_SEARCH_PARAMS = {
+    "search_depth": "advanced",
+    "include_answer": False,
+    "include_raw_content": False,
+    "include_images": False
+}
+
+atexit.register(_http_client.close)
+
+def _create_llm(model: str, temperature: float, http_async_client: Optional[httpx.AsyncClient] = None) -> ChatOpenAI:
+    """공용 HTTP 클라이언트를 사용하는 LLM 클라이언트 생성"""
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        openai_api_key=OPENAI_API_KEY,
+        http_client=_http_client,
+        http_async_client=http_async_client
+    )
+
+@lru_cache(maxsize=None)
+def _llm(model: str, temperature: float) -> ChatOpenAI:
+    """모델 설정별 LLM 클라이언트를 한 번만 생성하여 재사용 (동기 호출용)"""
+    return _create_llm(model, temperature)
+
+def _get_cached_search(cache_key: str) -> Optional[List[Dict[str, Any]]]:
+    """메모리 캐시, 디스크 캐시 순으로 검색 결과 조회"""
+    results = _search_memory_cache.get(cache_key)
+    if results is None:
+        results = _search_cache.get(cache_key)
+        if results is not None:
+            _search_memory_cache.set(cache_key, results)
+    return results
+
+def _set_cached_search(cache_key: str, results: List[Dict[str, Any]]) -> None:
+    """검색 결과를 메모리/디스크 캐시에 저장"""
+    _search_memory_cache.set(cache_key, results)
+    _search_cache.set(cache_key, results)
+
+def _tavily_cache_key(query: str, max_results: int) -> str:
+    """요청 옵션까지 포함한 Tavily 검색 캐시 키"""
+    return make_cache_key({"query": query, "max_results": max_results, **TAVILY_SEARCH_PARAMS})
+
+def _normalize_tavily_results(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """동기/비동기 경로의 검색 결과를 같은 형태로 정리"""
+    return [
+        {
+            "title": result.get("title", ""),
+            "url": result.get("url", ""),
+            "content": result.get("content", "")
+        }
+        for result in results
+    ]
+
+def cached_tavily_results(query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+    """
+    Tavily 검색 결과를 캐시와 함께 조회합니다. (캐시 적중 시 API 호출 생략)
+    
+    Args:
+        query: 검색 쿼리
+        max_results: 최대 검색 결과 수
+        
+    Returns:
+        List[Dict]: 검색 결과 목록
+    """
+    cache_key = _tavily_cache_key(query, max_results)
+    results = _get_cached_search(cache_key)
+    
+    if results is not None:
+        print(f"💾 검색 캐시 적중: Tavily 호출 생략 ({query})")
+        return results
+    
+    search = TavilySearchAPIWrapper(tavily_api_key=TAVILY_API_KEY)
+    raw_results = search.raw_results(query, max_results=max_results, **TAVILY_SEARCH_PARAMS)
+    results = _normalize_tavily_results(raw_results.get("results", []))
+    
+    _set_cached_search(cache_key, results)
+    return results
+
+async def acached_tavily_results(query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+    """
+    cached_tavily_results의 비동기 버전 (현재 루프의 AsyncClient로 Tavily API 직접 호출)
+    """
+    cache_key = _tavily_cache_key(query, max_results)
+    results = _get_cached_search(cache_key)
+    
+    if results is not None:
+        print(f"💾 검색 캐시 적중: Tavily 호출 생략 ({query})")
+        return results
+    
+    payload = {"api_key": TAVILY_API_KEY, "query": query, "max_results": max_results, **TAVILY_SEARCH_PARAMS}
+    client = _async_http_client.get()
+    if client is None:
+        async with httpx.AsyncClient(timeout=30) as client:
+            response = await client.post(TAVILY_SEARCH_URL, json=payload)
+    else:
+        response = await client.post(TAVILY_SEARCH_URL, json=payload)
+    response.raise_for_status()
+    results = _normalize_tavily_results(response.json().get("results", []))
+    
+    _set_cached_search(cache_key, results)
+    return results
+
+def _build_search_query(service_name: str, service_description: str = "") -> str:
+    """서비스 검색 쿼리 구성"""
+    search_query = f"{service_name} AI service features and technology"
+    if service_description:
+        search_query += f" {service_description}"
+    return search_query
+
+def _extract_search_info(search_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    검색 결과에서 프롬프트에 필요한 정보를 추출합니다.
+    """
+    # 프롬프트에 쓰는 필드만 남기고 본문은 미리 잘라 상태/저장 크기 축소
+    search_results = [
+        {
+            "title": result.get("title", ""),
+            "url": result.get("url", ""),
+            "content": result.get("content", "")[:500]
+        }
+        for result in search_results
+    ]
+    
+    # 검색 결과에서 필요한 정보 추출
+    extracted_info = {
+        "description": "",
+        "features": [],
+        "target_users": "",
+        "tech_stack": "",
+        "search_results": search_results
+    }
+    
+    # 검색 결과에서 주요 텍스트 통합
+    combined_text = "".join(
+        result["content"] + "\n\n" for result in search_results if "content" in result
+    )
+    
+    extracted_info["description"] = combined_text[:500] + "..." if len(combined_text) > 500 else combined_text
+    
+    return extracted_info
+
 # 서비스 정보 검색 함수
 def search_service_info(service_name: str, service_description: str = "") -> Dict[str, Any]:
     """
@@ -43,198 +244,340 @@ def search_service_info(service_name: str, service_description: str = "") -> Dic
     """
     try:
         # Tavily API 키 확인
-        tavily_api_key = os.getenv("TAVILY_API_KEY")
-        if not tavily_api_key:
+        if not TAVILY_API_KEY:
             print("⚠️ Tavily API 키가 설정되지 않았습니다. 검색 기능을 사용할 수 없습니다.")
             return {"error": "Tavily API 키 없음"}
         
-        # 검색 쿼리 구성
-        search_query = f"{service_name} AI service features and technology"
-        if service_description:
-            search_query += f" {service_description}"
-        
-        # Tavily 검색 실행
-        search = TavilySearchAPIWrapper()
-        search_results = search.results(search_query, max_results=5)
-        
-        # 검색 결과에서 필요한 정보 추출
-        extracted_info = {
-            "description": "",
-            "features": [],
-            "target_users": "",
-            "tech_stack": "",
-            "search_results": search_results
-        }
-        
-        # 검색 결과에서 주요 텍스트 통합
-        combined_text = ""
-        for result in search_results:
-            if "content" in result:
-                combined_text += result["content"] + "\n\n"
+        # Tavily 검색 실행 (동일 쿼리는 캐시된 결과 재사용)
+        search_query = _build_search_query(service_name, service_description)
+        search_results = cached_tavily_results(search_query, max_results=5)
         
-        extracted_info["description"] = combined_text[:500] + "..." if len(combined_text) > 500 else combined_text
-        
-        return extracted_info
+        return _extract_search_info(search_results)
         
     except Exception as e:
         print(f"⚠️ 서비스 정보 검색 중 오류 발생: {str(e)}")
         return {"error": str(e)}
 
-# 에이전트 노드: 서비스 정보 분석
-def analyze_service(state: ServiceAnalysisState) -> ServiceAnalysisState:
+async def asearch_service_info(service_name: str, service_description: str = "") -> Dict[str, Any]:
     """
-    AI 서비스 정보를 분석하여 주요 특징, 대상 기능, 사용자 그룹 등을 정리합니다.
+    search_service_info의 비동기 버전
     """
-    print(f"🔍 서비스 정보 분석 시작: {state.service_name}")
-    timestamp = datetime.now().isoformat()
-    
     try:
-        # OpenAI API 키 가져오기
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        if not openai_api_key:
-            raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
-        
-        # 서비스 정보 확인
-        if not state.service_name:
-            raise ValueError("분석할 서비스 이름이 지정되지 않았습니다.")
-        
-        # 서비스 정보 가져오기 - Tavily 검색 사용
-        print(f"🌐 '{state.service_name}' 정보 검색 중...")
-        service_info = search_service_info(state.service_name, state.service_description)
-        
-        # 검색 오류 확인
-        if "error" in service_info:
-            print(f"⚠️ 검색 오류: {service_info['error']}")
-            # 기본 서비스 설명 사용
-            if state.service_description:
-                service_info = {"description": state.service_description}
-            else:
-                service_info = {"description": f"{state.service_name}에 대한 AI 서비스 정보"}
-        
-        # 추가 정보가 있으면 병합
-        if state.additional_data:
-            service_info.update(state.additional_data)
+        # Tavily API 키 확인
+        if not TAVILY_API_KEY:
+            print("⚠️ Tavily API 키가 설정되지 않았습니다. 검색 기능을 사용할 수 없습니다.")
+            return {"error": "Tavily API 키 없음"}
         
-        # 검색 결과 저장
-        search_results = service_info.pop("search_results", []) if "search_results" in service_info else []
+        search_query = _build_search_query(service_name, service_description)
+        search_results = await acached_tavily_results(search_query, max_results=5)
         
-        # LLM 초기화
-        llm = ChatOpenAI(temperature=0, model="gpt-4o-mini", openai_api_key=openai_api_key)
+        return _extract_search_info(search_results)
         
-        # 프롬프트 템플릿 정의
-        template = """
-        당신은 AI 서비스 분석 전문가입니다. 제공된 AI 서비스에 대한 정보를 분석하여 다음 형식으로 서비스 개요를 작성해 주세요.
+    except Exception as e:
+        print(f"⚠️ 서비스 정보 검색 중 오류 발생: {str(e)}")
+        return {"error": str(e)}
+
+# 서비스 개요 출력 스키마 (LLM 구조화 출력으로 검증된 JSON을 바로 받음)
+class ServiceSummarySchema(BaseModel):
+    """AI 서비스 개요"""
+    service_name: str = Field(description="서비스 이름")
+    type: str = Field(description="서비스 유형(추천, 생성형, 분류, 예측 등)")
+    description: str = Field(description="250자 내외 서비스 개요")
+    primary_features: List[str] = Field(description="주요 기능 목록")
+    target_users: List[str] = Field(description="대상 사용자 그룹 목록")
+    data_sources: List[str] = Field(description="사용 데이터 소스 목록")
+    technology: List[str] = Field(description="사용 기술 목록")
+    ethical_concerns: List[str] = Field(description="잠재적 윤리 이슈 목록 (5개 이내)")
+    analysis_scope: List[str] = Field(description="진단 범위 항목 목록 (5개 이내)")
+
+# 서비스 분석 프롬프트 템플릿
+ANALYSIS_PROMPT_TEMPLATE = """
+        당신은 AI 서비스 분석 전문가입니다. 제공된 AI 서비스에 대한 정보를 분석하여 서비스 개요를 작성해 주세요.
         
         서비스 정보:
         - 이름: {service_name}
         - 설명: {service_description}
         - 검색된 정보: {search_results}
         
-        다음 형식으로 정리된 JSON을 작성해주세요:
-        ```json
-        {{
-            "service_name": "서비스 이름",
-            "type": "서비스 유형(추천, 생성형, 분류, 예측 등)",
-            "description": "250자 내외 서비스 개요",
-            "primary_features": ["주요 기능 1", "주요 기능 2", "주요 기능 3"],
-            "target_users": ["대상 사용자 그룹 1", "대상 사용자 그룹 2"],
-            "data_sources": ["사용 데이터 소스 1", "사용 데이터 소스 2"],
-            "technology": ["사용 기술 1", "사용 기술 2"],
-            "ethical_concerns": ["잠재적 윤리 이슈 1", "잠재적 윤리 이슈 2", "잠재적 윤리 이슈 3"],
-            "analysis_scope": ["진단 범위 항목 1", "진단 범위 항목 2", "진단 범위 항목 3"]
-        }}
-        ```
-        
         특히 ethical_concerns와 analysis_scope는 해당 서비스의 특성을 고려하여 윤리적 진단이 필요한 항목들을 5개 이내로 정확히 작성해주세요.
         잠재적 윤리 이슈에는 편향성, 프라이버시, 투명성, 안전성 등의 관점에서 구체적으로 작성해주세요.
         검색 결과가 제한적이거나 불명확한 경우에는 서비스 이름과 일반적인 AI 서비스 특성을 기반으로 최대한 합리적인 추론을 통해 작성해주세요.
         """
+
+@lru_cache(maxsize=1)
+def _get_chain():
+    """서비스 분석 프롬프트와 LLM을 연결한 체인을 한 번만 생성하여 재사용"""
+    return _build_chain(_llm(ANALYSIS_MODEL, 0))
+
+def _build_chain(llm: ChatOpenAI):
+    """서비스 분석 프롬프트와 구조화 출력 LLM 연결"""
+    prompt = ChatPromptTemplate.from_template(ANALYSIS_PROMPT_TEMPLATE)
+    return prompt | llm.with_structured_output(ServiceSummarySchema)
+
+@asynccontextmanager
+async def _async_http_scope():
+    """
+    현재 이벤트 루프에서 사용할 AsyncClient와 비동기 분석 체인을 만들고,
+    범위를 벗어나면 같은 루프에서 클라이언트를 닫습니다.
+    """
+    async with httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=30) as client:
+        client_token = _async_http_client.set(client)
+        chain_token = _async_chain.set(_build_chain(_create_llm(ANALYSIS_MODEL, 0, client)))
+        try:
+            yield
+        finally:
+            _async_chain.reset(chain_token)
+            _async_http_client.reset(client_token)
+
+def _prepare_service_info(state: ServiceAnalysisState, service_info: Dict[str, Any]) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    검색 결과에 기본 설명과 추가 정보를 반영하고 (서비스 정보, 검색 결과 목록)을 반환합니다.
+    """
+    # 검색 오류 확인
+    if "error" in service_info:
+        print(f"⚠️ 검색 오류: {service_info['error']}")
+        # 기본 서비스 설명 사용
+        if state.service_description:
+            service_info = {"description": state.service_description}
+        else:
+            service_info = {"description": f"{state.service_name}에 대한 AI 서비스 정보"}
+    
+    # 추가 정보가 있으면 얕은 병합 (원본 딕셔너리는 수정하지 않음)
+    if state.additional_data:
+        service_info = {**service_info, **state.additional_data}
+    
+    # 검색 결과 저장
+    search_results = service_info.pop("search_results", []) if "search_results" in service_info else []
+    
+    return service_info, search_results
+
+def _build_prompt_values(state: ServiceAnalysisState, service_info: Dict[str, Any], search_results: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    프롬프트 템플릿에 채울 값을 준비합니다.
+    """
+    # 검색 결과를 텍스트로 변환
+    parts = []
+    for i, result in enumerate(search_results):
+        parts.append(
+            f"\n[{i+1}] 제목: {result.get('title', 'No Title')}\n"
+            f"내용: {result.get('content', 'No Content')[:500]}...\n"
+            f"URL: {result.get('url', 'No URL')}\n"
+        )
+    
+    search_results_text = "".join(parts) or "검색 결과 없음"
+    
+    return {
+        "service_name": state.service_name,
+        "service_description": service_info.get("description", ""),
+        "search_results": search_results_text
+    }
+
+def _analysis_cache_key(prompt_values: Dict[str, str]) -> str:
+    """동일한 프롬프트 입력에 대한 응답 캐시 키 (temperature=0 호출이므로 결과 재사용 가능)"""
+    return make_cache_key({
+        "model": ANALYSIS_MODEL,
+        "prompt": prompt_values,
+        "template_ver": ANALYSIS_TEMPLATE_VERSION
+    })
+
+def _write_service_documents(pending: List[Tuple[str, Tuple[str, Dict[str, Any]]]]) -> None:
+    """서비스 개요 문서 묶음을 한 번의 호출로 VectorDB에 저장 (같은 ID는 덮어씀)"""
+    get_manager().add_documents(
+        collection_name=SERVICE_COLLECTION,
+        contents=[content for _, (content, _) in pending],
+        metadatas=[metadata for _, (_, metadata) in pending],
+        ids=[doc_id for doc_id, _ in pending]
+    )
+
+def flush_service_documents() -> int:
+    """
+    버퍼에 쌓인 서비스 개요 문서의 저장 작업을 백그라운드 스레드에 넘깁니다.
+    
+    Returns:
+        int: 저장을 요청한 문서 수
+    """
+    with _pending_service_lock:
+        if not _pending_service_docs:
+            return 0
+        pending = list(_pending_service_docs.items())
+        _pending_service_docs.clear()
+        _pending_writes.append(_write_executor.submit(_write_service_documents, pending))
+    
+    return len(pending)
+
+def wait_for_pending_writes() -> None:
+    """
+    버퍼에 남은 문서를 넘기고 백그라운드 저장 작업이 모두 끝날 때까지 대기합니다.
+    저장 중 발생한 오류는 여기서 다시 발생합니다.
+    """
+    flush_service_documents()
+    
+    with _pending_service_lock:
+        futures = list(_pending_writes)
+        _pending_writes.clear()
+    
+    for future in futures:
+        future.result()
+
+def _queue_service_document(doc_id: str, content: str, metadata: Dict[str, Any]) -> None:
+    """
+    서비스 개요 문서를 쓰기 버퍼에 추가 (같은 ID는 최신 내용으로 교체)
+    """
+    with _pending_service_lock:
+        _pending_service_docs[doc_id] = (content, metadata)
+        should_flush = len(_pending_service_docs) >= _SERVICE_FLUSH_SIZE
+    
+    if should_flush:
+        flush_service_documents()
+
+def _has_analysis_scope(service_summary: Dict[str, Any]) -> bool:
+    """요약에 진단 범위(ethical_concerns, analysis_scope)가 모두 있는지 확인"""
+    return "ethical_concerns" in service_summary and "analysis_scope" in service_summary
+
+def _apply_default_scope(service_summary: Dict[str, Any]) -> None:
+    """
+    요약에 진단 범위가 없으면 기본 범위로 채웁니다. (저장 전에 메모리에서만 처리)
+    """
+    if _has_analysis_scope(service_summary):
+        return
+    
+    # 요약 데이터에 진단 범위가 없는 경우 - 실제 구현에서는 LLM을 통해 추가 분석 가능
+    print(f"⚠️ 서비스 요약에 진단 범위가 명시되지 않았습니다. 기본 범위를 사용합니다.")
+    service_summary.update({
+        "ethical_concerns": list(DEFAULT_ETHICAL_CONCERNS),
+        "analysis_scope": list(DEFAULT_ANALYSIS_SCOPE)
+    })
+
+def _save_service_summary(service_name: str, service_summary: Dict[str, Any], timestamp: str) -> str:
+    """
+    서비스 개요를 VectorDB 쓰기 버퍼에 추가하고 문서 ID를 반환합니다.
+    """
+    doc_id = str(uuid4())
+    metadata = {
+        "service_name": service_name,
+        "timestamp": timestamp,
+        "content_type": "service_summary"
+    }
+    
+    _queue_service_document(doc_id, json_utils.dumps(service_summary), metadata)
+    return doc_id
+
+def _check_analysis_input(state: ServiceAnalysisState) -> None:
+    """분석에 필요한 API 키와 서비스 이름 확인"""
+    # OpenAI API 키 가져오기
+    if not OPENAI_API_KEY:
+        raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
+    
+    # 서비스 정보 확인
+    if not state.service_name:
+        raise ValueError("분석할 서비스 이름이 지정되지 않았습니다.")
+
+def _completed_state(
+    state: ServiceAnalysisState,
+    doc_id: str,
+    service_summary: Dict[str, Any],
+    search_results: List[Dict[str, Any]],
+    timestamp: str
+) -> ServiceAnalysisState:
+    """분석 완료 결과를 상태에 반영 (모델 재생성 없이 필드만 갱신)"""
+    print(f"✅ 서비스 분석 완료: {state.service_name}")
+    
+    state.doc_id = doc_id
+    state.chunk_ids = []  # 청크 처리 - 실제 상황에서는 필요시 서비스 문서를 청크로 나누어 저장
+    state.summary = service_summary
+    state.search_results = search_results
+    state.status = "completed"
+    state.timestamp = timestamp
+    return state
+
+def _failed_state(state: ServiceAnalysisState, error: Exception, timestamp: str) -> ServiceAnalysisState:
+    """분석 실패 결과를 상태에 반영 (모델 재생성 없이 필드만 갱신)"""
+    error_message = f"서비스 분석 중 오류 발생: {str(error)}"
+    print(f"❌ {error_message}")
+    
+    state.status = "failed"
+    state.error_message = error_message
+    state.timestamp = timestamp
+    return state
+
+# 에이전트 노드: 서비스 정보 분석
+def analyze_service(state: ServiceAnalysisState) -> ServiceAnalysisState:
+    """
+    AI 서비스 정보를 분석하여 주요 특징, 대상 기능, 사용자 그룹 등을 정리합니다.
+    """
+    print(f"🔍 서비스 정보 분석 시작: {state.service_name}")
+    timestamp = datetime.now().isoformat()
+    
+    try:
+        _check_analysis_input(state)
         
-        # 검색 결과를 텍스트로 변환
-        search_results_text = ""
-        for i, result in enumerate(search_results):
-            search_results_text += f"\n[{i+1}] 제목: {result.get('title', 'No Title')}\n"
-            search_results_text += f"내용: {result.get('content', 'No Content')[:500]}...\n"
-            search_results_text += f"URL: {result.get('url', 'No URL')}\n"
+        # 서비스 정보 가져오기 - Tavily 검색 사용
+        print(f"🌐 '{state.service_name}' 정보 검색 중...")
+        service_info, search_results = _prepare_service_info(
+            state, search_service_info(state.service_name, state.service_description)
+        )
+        prompt_values = _build_prompt_values(state, service_info, search_results)
         
-        if not search_results_text:
-            search_results_text = "검색 결과 없음"
+        cache_key = _analysis_cache_key(prompt_values)
+        service_summary = _analysis_cache.get(cache_key)
         
-        # 프롬프트에 필요한 값 준비
-        prompt_values = {
-            "service_name": state.service_name,
-            "service_description": service_info.get("description", ""),
-            "search_results": search_results_text
-        }
+        if service_summary is not None:
+            print("💾 서비스 분석 캐시 적중: LLM 호출 생략")
+        else:
+            # LLM 호출 (스키마로 검증된 구조화 출력)
+            service_summary = _get_chain().invoke(prompt_values).model_dump()
+            _analysis_cache.set(cache_key, service_summary)
         
-        # 프롬프트 생성 및 LLM 호출
-        prompt = ChatPromptTemplate.from_template(template)
-        chain = prompt | llm
-        response = chain.invoke(prompt_values)
+        # 진단 범위까지 채운 최종 요약을 한 번만 저장
+        _apply_default_scope(service_summary)
         
-        # JSON 응답 파싱
-        response_text = response.content
-        json_start = response_text.find('```json')
-        json_end = response_text.rfind('```')
+        # VectorDB에 저장
+        doc_id = _save_service_summary(state.service_name, service_summary, timestamp)
         
-        if json_start >= 0 and json_end > json_start:
-            json_text = response_text[json_start+7:json_end].strip()
-            service_summary = json.loads(json_text)
-        else:
-            service_summary = json.loads(response_text)
+        return _completed_state(state, doc_id, service_summary, search_results, timestamp)
         
-        # VectorDB에 저장
-        db_manager = VectorDBManager()
-        collection_name = "service_info"
+    except Exception as e:
+        return _failed_state(state, e, timestamp)
+
+async def analyze_service_async(state: ServiceAnalysisState) -> ServiceAnalysisState:
+    """
+    analyze_service의 비동기 버전 (여러 서비스를 동시에 분석할 때 사용)
+    Tavily 검색과 LLM 호출은 현재 루프의 AsyncClient로, VectorDB 저장은 스레드에서 수행합니다.
+    """
+    # 일괄 분석 밖에서 단독 호출된 경우 이 호출 동안만 쓸 클라이언트 생성
+    if _async_chain.get() is None:
+        async with _async_http_scope():
+            return await analyze_service_async(state)
+    
+    print(f"🔍 서비스 정보 분석 시작: {state.service_name}")
+    timestamp = datetime.now().isoformat()
+    
+    try:
+        _check_analysis_input(state)
         
-        # 컬렉션 생성 (없는 경우)
-        if not db_manager.collection_exists(collection_name):
-            db_manager.create_collection(collection_name)
+        # 서비스 정보 가져오기 - Tavily 검색 사용
+        print(f"🌐 '{state.service_name}' 정보 검색 중...")
+        search_info = await asearch_service_info(state.service_name, state.service_description)
+        service_info, search_results = _prepare_service_info(state, search_info)
+        prompt_values = _build_prompt_values(state, service_info, search_results)
         
-        # 서비스 정보 저장
-        doc_content = json.dumps(service_summary, ensure_ascii=False, indent=2)
-        metadata = {
-            "service_name": state.service_name,
-            "timestamp": timestamp,
-            "content_type": "service_summary"
-        }
+        cache_key = _analysis_cache_key(prompt_values)
+        service_summary = _analysis_cache.get(cache_key)
         
-        doc_id = db_manager.add_document(
-            collection_name=collection_name,
-            content=doc_content,
-            metadata=metadata
-        )[0]
+        if service_summary is not None:
+            print("💾 서비스 분석 캐시 적중: LLM 호출 생략")
+        else:
+            service_summary = (await _async_chain.get().ainvoke(prompt_values)).model_dump()
+            _analysis_cache.set(cache_key, service_summary)
         
-        # 청크 처리 - 실제 상황에서는 필요시 서비스 문서를 청크로 나누어 저장
-        chunk_ids = []
+        _apply_default_scope(service_summary)
         
-        # 결과 반환
-        print(f"✅ 서비스 분석 완료: {state.service_name}")
+        doc_id = await asyncio.to_thread(_save_service_summary, state.service_name, service_summary, timestamp)
         
-        return ServiceAnalysisState(
-            service_name=state.service_name,
-            service_description=state.service_description,
-            additional_data=state.additional_data,
-            doc_id=doc_id,
-            chunk_ids=chunk_ids,
-            summary=service_summary,
-            search_results=search_results,
-            status="completed",
-            timestamp=timestamp
-        )
+        return _completed_state(state, doc_id, service_summary, search_results, timestamp)
         
     except Exception as e:
-        error_message = f"서비스 분석 중 오류 발생: {str(e)}"
-        print(f"❌ {error_message}")
-        
-        return ServiceAnalysisState(
-            service_name=state.service_name,
-            service_description=state.service_description,
-            additional_data=state.additional_data,
-            status="failed",
-            error_message=error_message,
-            timestamp=timestamp
-        )
+        return _failed_state(state, e, timestamp)
 
 # 에이전트 노드: 진단 범위 제안
 def suggest_analysis_scope(state: ServiceAnalysisState) -> ServiceAnalysisState:
@@ -248,78 +591,32 @@ def suggest_analysis_scope(state: ServiceAnalysisState) -> ServiceAnalysisState:
         return state
     
     try:
-        # 이미 분석된 요약 정보에서 진단 범위 추출 (ethical_concerns, analysis_scope)
-        if "ethical_concerns" in state.summary and "analysis_scope" in state.summary:
-            # 이미 진단 범위가 결정되어 있으므로 추가 작업 없이 완료 처리
-            print(f"✅ 진단 범위 확정 완료: {state.service_name}")
-            return state
-        else:
-            # 요약 데이터에 진단 범위가 없는 경우 - 실제 구현에서는 LLM을 통해 추가 분석 가능
-            print(f"⚠️ 서비스 요약에 진단 범위가 명시되지 않았습니다. 기본 범위를 사용합니다.")
-            
-            # 기본 진단 범위 설정
-            state.summary.update({
-                "ethical_concerns": [
-                    "데이터 편향성",
-                    "프라이버시 침해",
-                    "투명성과 설명가능성",
-                    "안전성과 신뢰성",
-                    "책임성"
-                ],
-                "analysis_scope": [
-                    "편향성 평가 및 완화 방안",
-                    "개인정보 수집·이용·보호",
-                    "의사결정 과정 투명성",
-                    "시스템 안전성 검증",
-                    "책임 소재 명확화"
-                ]
-            })
-            
-            # 업데이트된 요약 정보 다시 저장
-            if state.doc_id:
-                db_manager = VectorDBManager()
-                doc_content = json.dumps(state.summary, ensure_ascii=False, indent=2)
-                metadata = {
-                    "service_name": state.service_name,
-                    "timestamp": datetime.now().isoformat(),
-                    "content_type": "service_summary_updated"
-                }
-                
-                db_manager.update_document(
-                    collection_name="service_info",
-                    doc_id=state.doc_id,
-                    content=doc_content,
-                    metadata=metadata
-                )
-            
-            return state
+        # 진단 범위는 analyze_service에서 저장 전에 확정되므로 여기서는 확인만 수행 (DB 쓰기 없음)
+        _apply_default_scope(state.summary)
+        
+        print(f"✅ 진단 범위 확정 완료: {state.service_name}")
+        return state
             
     except Exception as e:
         error_message = f"진단 범위 제안 중 오류 발생: {str(e)}"
         print(f"❌ {error_message}")
         
-        return ServiceAnalysisState(
-            service_name=state.service_name,
-            service_description=state.service_description,
-            additional_data=state.additional_data,
-            doc_id=state.doc_id,
-            chunk_ids=state.chunk_ids,
-            summary=state.summary,
-            search_results=state.search_results,
-            status="failed",
-            error_message=error_message,
-            timestamp=datetime.now().isoformat()
-        )
+        state.status = "failed"
+        state.error_message = error_message
+        state.timestamp = datetime.now().isoformat()
+        return state
+
+# 상태값별 다음 단계 (오류 발생 시 종료)
+_ROUTES = {"failed": "end"}
 
 # 워크플로우 제어 함수
 def router(state: ServiceAnalysisState) -> str:
     """상태에 따라 다음 단계를 결정합니다."""
-    if state.status == "failed":
-        return "end"  # 오류 발생 시 종료
-    elif not state.summary:  # 아직 분석되지 않은 경우
-        return "analyze"
-    else:
-        return "scope"  # 분석이 완료되어 범위 제안으로 이동
+    route = _ROUTES.get(state.status)
+    if route is not None:
+        return route
+    # 아직 분석되지 않았으면 분석, 분석이 완료되었으면 범위 제안으로 이동
+    return "scope" if state.summary else "analyze"
 
 # 그래프 구성
 def create_service_analysis_graph() -> StateGraph:
@@ -349,6 +646,28 @@ def create_service_analysis_graph() -> StateGraph:
     
     return workflow
 
+def _format_agent_result(service_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """에이전트 최종 상태를 반환용 딕셔너리로 변환"""
+    if "status" in result and result["status"] == "completed":
+        print(f"✅ 서비스 분석 성공: {service_name}")
+        return {
+            "service_name": result["service_name"],
+            "doc_id": result["doc_id"],
+            "chunk_ids": result["chunk_ids"],
+            "summary": result["summary"],
+            "status": "completed",
+            "timestamp": result["timestamp"]
+        }
+    else:
+        error_msg = result.get("error_message", "알 수 없는 오류")
+        print(f"❌ 서비스 분석 실패: {error_msg}")
+        return {
+            "service_name": service_name,
+            "status": "failed",
+            "error_message": error_msg,
+            "timestamp": datetime.now().isoformat()
+        }
+
 # 에이전트 실행 함수
 def run_service_analysis_agent(service_name: str, service_description: str = "", additional_data: Dict[str, Any] = None) -> Dict[str, Any]:
     """
@@ -371,26 +690,11 @@ def run_service_analysis_agent(service_name: str, service_description: str = "",
     try:
         result = app.invoke(initial_state)
         
+        # 버퍼에 남은 서비스 개요 문서 저장 (백그라운드에서 진행)
+        flush_service_documents()
+        
         # 결과는 딕셔너리처럼 접근해야 함 (AddableValuesDict 타입)
-        if "status" in result and result["status"] == "completed":
-            print(f"✅ 서비스 분석 성공: {service_name}")
-            return {
-                "service_name": result["service_name"],
-                "doc_id": result["doc_id"],
-                "chunk_ids": result["chunk_ids"],
-                "summary": result["summary"],
-                "status": "completed",
-                "timestamp": result["timestamp"]
-            }
-        else:
-            error_msg = result.get("error_message", "알 수 없는 오류")
-            print(f"❌ 서비스 분석 실패: {error_msg}")
-            return {
-                "service_name": service_name,
-                "status": "failed",
-                "error_message": error_msg,
-                "timestamp": datetime.now().isoformat()
-            }
+        return _format_agent_result(service_name, result)
     except Exception as e:
         error_message = f"에이전트 실행 중 오류 발생: {str(e)}"
         print(f"❌ {error_message}")
@@ -401,6 +705,42 @@ def run_service_analysis_agent(service_name: str, service_description: str = "",
             "timestamp": datetime.now().isoformat()
         }
 
+async def arun_service_analysis_agent(service_name: str, service_description: str = "", additional_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    서비스 분석 에이전트를 별도 스레드에서 실행합니다. (다른 단계와 동시 실행용)
+    """
+    return await asyncio.to_thread(run_service_analysis_agent, service_name, service_description, additional_data)
+
+async def run_service_analysis_agent_batch(service_names: List[str], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+    """
+    여러 서비스를 동시에 분석합니다. (API 속도 제한을 위해 동시 실행 수 제한)
+    
+    Args:
+        service_names: 분석할 서비스 이름 목록
+        max_concurrency: 최대 동시 분석 수
+        
+    Returns:
+        List[Dict]: 입력 순서와 동일한 서비스별 분석 결과
+    """
+    print(f"🚀 서비스 일괄 분석 시작: {len(service_names)}개")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def analyze_one(service_name: str) -> Dict[str, Any]:
+        async with semaphore:
+            state = await analyze_service_async(ServiceAnalysisState(service_name=service_name))
+            if state.status != "failed":
+                state = await asyncio.to_thread(suggest_analysis_scope, state)
+        return _format_agent_result(service_name, state.model_dump())
+    
+    # 이 루프에서 만든 AsyncClient를 모든 분석 작업이 공유하고 끝나면 닫음
+    async with _async_http_scope():
+        results = await asyncio.gather(*(analyze_one(name) for name in service_names))
+    
+    # 버퍼에 남은 서비스 개요 문서 저장 완료 대기
+    await asyncio.to_thread(wait_for_pending_writes)
+    
+    return results
+
 # 테스트 실행
 if __name__ == "__main__":
     # Microsoft Azure AI Vision Face API 테스트
@@ -408,8 +748,11 @@ if __name__ == "__main__":
     service_description = "얼굴 감지, 식별, 감정 분석 등 얼굴 관련 컴퓨터 비전 기능을 제공하는 클라우드 API 서비스"
     
     # 테스트 시 API 키 확인
-    print(f"OpenAI API 키 상태: {'설정됨' if os.getenv('OPENAI_API_KEY') else '설정되지 않음'}")
-    print(f"Tavily API 키 상태: {'설정됨' if os.getenv('TAVILY_API_KEY') else '설정되지 않음'}")
+    print(f"OpenAI API 키 상태: {'설정됨' if OPENAI_API_KEY else '설정되지 않음'}")
+    print(f"Tavily API 키 상태: {'설정됨' if TAVILY_API_KEY else '설정되지 않음'}")
+    if not OPENAI_API_KEY:
+        print("⚠️ OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
+        exit(1)
     
     # 에이전트 실행 - 이제 직접 서비스 정보 전달
     result = run_service_analysis_agent(
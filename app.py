@@ -1,11 +1,12 @@
 import os
+import asyncio
 from datetime import datetime
 import json
 from dotenv import load_dotenv
 
 # 에이전트 모듈 임포트
-from agents.guideline_embedder import run_embedding_agent
-from agents.service_info import run_service_analysis_agent 
+from agents.guideline_embedder import arun_embedding_agent
+from agents.service_info import arun_service_analysis_agent, wait_for_pending_writes
 from agents.scope_validator import run_scope_validator
 from agents.risk_assessment import run_ethical_risk_agent
 from agents.improvement_suggester import run_improvement_suggester
@@ -14,26 +15,26 @@ from agents.report import run_report_agent
 # 환경변수 로드
 load_dotenv()
 
-def run_pipeline(service_name: str, service_description: str = ""):
+async def run_pipeline(service_name: str, service_description: str = ""):
     """
     전체 AI 윤리성 리스크 진단 파이프라인을 실행합니다.
+    서로 독립적인 가이드라인 임베딩과 서비스 분석은 동시에 실행합니다.
     """
     print(f"🚀 {service_name}에 대한 AI 윤리성 리스크 진단 시작")
     start_time = datetime.now()
     
-    # 1. 가이드라인 임베딩 에이전트 실행
-    print("\n===== 1단계: 가이드라인 임베딩 =====")
-    embedding_result = run_embedding_agent()
+    # 1~2. 가이드라인 임베딩 에이전트와 서비스 분석 에이전트 동시 실행
+    print("\n===== 1~2단계: 가이드라인 임베딩 / 서비스 분석 (동시 실행) =====")
+    embedding_result, service_result = await asyncio.gather(
+        arun_embedding_agent(),
+        arun_service_analysis_agent(service_name, service_description)
+    )
     
     # 임베딩 실패 시 중단
     if embedding_result.get("embedding_status") == "failed":
         print(f"❌ 가이드라인 임베딩 실패: {embedding_result.get('error_message')}")
         return {"status": "failed", "error": embedding_result.get("error_message")}
     
-    # 2. 서비스 분석 에이전트 실행
-    print("\n===== 2단계: 서비스 분석 =====")
-    service_result = run_service_analysis_agent(service_name, service_description)
-    
     # 서비스 분석 실패 시 중단
     if service_result.get("status") == "failed":
         print(f"❌ 서비스 분석 실패: {service_result.get('error_message', '알 수 없는 오류')}")
@@ -82,6 +83,13 @@ def run_pipeline(service_name: str, service_description: str = ""):
         print(f"❌ 보고서 작성 실패: {report_result.get('error_message')}")
         return {"status": "failed", "error": report_result.get("error_message")}
     
+    # 백그라운드에서 진행된 서비스 정보 VectorDB 저장 완료 대기
+    try:
+        await asyncio.to_thread(wait_for_pending_writes)
+    except Exception as e:
+        print(f"❌ 서비스 정보 저장 실패: {str(e)}")
+        return {"status": "failed", "error": str(e)}
+    
     # 전체 파이프라인 실행 시간
     end_time = datetime.now()
     execution_time = end_time - start_time
@@ -108,7 +116,7 @@ if __name__ == "__main__":
         exit(1)
     
     # 파이프라인 실행
-    result = run_pipeline(service_name, service_description)
+    result = asyncio.run(run_pipeline(service_name, service_description))
     
     # 결과 출력
     if result["status"] == "completed":
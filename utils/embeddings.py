@@ -0,0 +1,336 @@
+"""
+HuggingFace 임베딩 모델 생성 유틸리티
+GPU가 있으면 fp16으로 올려 인코딩하고, 없으면 CPU fp32로 대체
+선택적으로 ONNX Runtime으로 변환한 모델을 사용할 수 있음
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from langchain.embeddings.base import Embeddings
+from langchain_huggingface import HuggingFaceEmbeddings
+
+DEFAULT_EMBEDDING_MODEL = "nlpai-lab/KURE-v1"
+ONNX_MODEL_DIR = "./models"
+EMBED_CACHE_PATH = "./outputs/embed_cache.sqlite3"
+
+
+class ORTEmbeddings(Embeddings):
+    """
+    ONNX Runtime으로 실행하는 HuggingFace 인코더 임베딩
+    최초 실행 시 모델을 ONNX로 변환하여 저장하고 이후에는 저장본을 재사용
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+        export_dir: Optional[str] = None,
+        batch_size: int = 64,
+        max_length: int = 512,
+        pooling: str = "cls",
+    ):
+        """
+        Args:
+            model_name: 변환할 HuggingFace 모델명
+            export_dir: ONNX 모델 저장 경로 (기본값: ./models/<모델명>-onnx)
+            batch_size: 한 번에 인코딩할 문장 수
+            max_length: 최대 토큰 길이 (초과분은 잘라냄)
+            pooling: 문장 벡터 풀링 방식 ("cls" 또는 "mean")
+        """
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.pooling = pooling
+
+        export_dir = export_dir or os.path.join(
+            ONNX_MODEL_DIR, f"{model_name.split('/')[-1].lower()}-onnx"
+        )
+
+        # GPU 실행 제공자가 있으면 우선 사용하고 그래프 최적화는 최대로 적용
+        if "CUDAExecutionProvider" in ort.get_available_providers():
+            provider = "CUDAExecutionProvider"
+        else:
+            provider = "CPUExecutionProvider"
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+        if os.path.isdir(export_dir):
+            self.model = ORTModelForFeatureExtraction.from_pretrained(
+                export_dir, provider=provider, session_options=session_options
+            )
+            self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        else:
+            print(f"ONNX 모델 변환 중: {model_name} -> {export_dir}")
+            self.model = ORTModelForFeatureExtraction.from_pretrained(
+                model_name, export=True, provider=provider, session_options=session_options
+            )
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            self.model.save_pretrained(export_dir)
+            self.tokenizer.save_pretrained(export_dir)
+
+    def _encode(self, texts: List[str]):
+        import numpy as np
+
+        inputs = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np",
+        )
+        hidden = np.asarray(self.model(**inputs).last_hidden_state, dtype=np.float32)
+
+        if self.pooling == "mean":
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            vectors = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        else:
+            vectors = hidden[:, 0]
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        # 토큰 길이가 비슷한 문장끼리 묶어 배치별 패딩 최소화
+        lengths = [
+            len(ids) for ids in
+            self.tokenizer(texts, truncation=True, max_length=self.max_length)["input_ids"]
+        ]
+        order = sorted(range(len(texts)), key=lambda i: lengths[i], reverse=True)
+
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            vectors = self._encode([texts[i] for i in batch])
+            for i, vector in zip(batch, vectors):
+                results[i] = vector.tolist()
+
+        return results
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        # 쿼리와 문서를 같은 방식으로 인코딩하므로 배치 문서 임베딩과 동일
+        return self.embed_documents(texts)
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    문서 임베딩 결과를 SQLite에 저장해 재사용하는 래퍼
+    같은 모델과 같은 텍스트는 다시 인코딩하지 않음 (벡터는 fp16 또는 int8로 저장)
+    """
+
+    # 저장 정밀도별 테이블 (정밀도가 다른 벡터가 섞이지 않도록 분리)
+    _TABLES = {"float16": "embeddings", "int8": "embeddings_int8"}
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        cache_path: str = EMBED_CACHE_PATH,
+        storage_dtype: str = "float16",
+    ):
+        """
+        Args:
+            embeddings: 실제 인코딩을 수행할 임베딩 모델
+            model_name: 캐시 키에 포함할 모델명 (모델이 바뀌면 캐시도 분리)
+            cache_path: SQLite 캐시 파일 경로
+            storage_dtype: 벡터 저장 정밀도 ("float16": 1/2 크기, "int8": 벡터별 스케일과 함께 약 1/4 크기)
+        """
+        if storage_dtype not in self._TABLES:
+            raise ValueError(f"지원하지 않는 저장 정밀도입니다: {storage_dtype}")
+
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache_path = cache_path
+        self.storage_dtype = storage_dtype
+        self._table = self._TABLES[storage_dtype]
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(cache_path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._table} (key TEXT PRIMARY KEY, vec BLOB)"
+        )
+        self._conn.commit()
+
+    def _key(self, text: str) -> str:
+        payload = f"{self.model_name}\0{text}".encode("utf-8")
+        return hashlib.blake2b(payload, digest_size=32).hexdigest()
+
+    def _encode_vector(self, vector) -> bytes:
+        import numpy as np
+
+        vector = np.asarray(vector, dtype=np.float32)
+        if self.storage_dtype == "int8":
+            # 벡터별 최대 절댓값을 127에 맞추는 대칭 양자화 (스케일을 앞 4바이트에 저장)
+            scale = np.float32(max(float(np.abs(vector).max()), 1e-12) / 127.0)
+            codes = np.round(vector / scale).astype(np.int8)
+            return scale.tobytes() + codes.tobytes()
+        return vector.astype(np.float16).tobytes()
+
+    def _decode_vector(self, blob: bytes) -> List[float]:
+        import numpy as np
+
+        if self.storage_dtype == "int8":
+            scale = np.frombuffer(blob[:4], dtype=np.float32)[0]
+            codes = np.frombuffer(blob[4:], dtype=np.int8)
+            return (codes.astype(np.float32) * scale).tolist()
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        keys = [self._key(text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+
+        # 캐시 조회 (SQLite 변수 개수 제한을 고려해 나누어 조회)
+        cached = {}
+        with self._lock:
+            for start in range(0, len(unique_keys), 500):
+                part = unique_keys[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, vec FROM {self._table} WHERE key IN ({placeholders})", part
+                ).fetchall()
+                for key, blob in rows:
+                    cached[key] = self._decode_vector(blob)
+
+        # 캐시에 없는 텍스트만 한 번에 인코딩
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            rows = []
+            for key, vector in zip(missing, vectors):
+                blob = self._encode_vector(vector)
+                # 캐시 적중 여부와 관계없이 같은 값이 저장되도록 저장 정밀도로 반올림한 벡터 반환
+                cached[key] = self._decode_vector(blob)
+                rows.append((key, blob))
+            with self._lock:
+                self._conn.executemany(
+                    f"INSERT OR IGNORE INTO {self._table} (key, vec) VALUES (?, ?)", rows
+                )
+                self._conn.commit()
+
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        return embed_queries(self.embeddings, texts)
+
+
+def embed_queries(embeddings: Embeddings, texts: List[str]) -> List[List[float]]:
+    """
+    여러 쿼리를 embed_query와 같은 방식(쿼리용 인코딩 설정)으로 한 번에 임베딩
+
+    Args:
+        embeddings: 임베딩 모델
+        texts: 쿼리 목록
+
+    Returns:
+        List[List[float]]: 쿼리 순서와 동일한 임베딩 목록
+    """
+    if not texts:
+        return []
+
+    if hasattr(embeddings, "embed_queries"):
+        return embeddings.embed_queries(texts)
+
+    if isinstance(embeddings, HuggingFaceEmbeddings):
+        # HuggingFaceEmbeddings.embed_query와 같은 전처리/인코딩 설정을 배치에 적용
+        encode_kwargs = embeddings.query_encode_kwargs or embeddings.encode_kwargs
+        texts = [text.replace("\n", " ") for text in texts]
+        vectors = embeddings.client.encode(texts, **encode_kwargs)
+        return [list(map(float, vector)) for vector in vectors]
+
+    return [embeddings.embed_query(text) for text in texts]
+
+
+def create_hf_embeddings(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    batch_size: int = 64,
+    backend: str = "torch",
+) -> Embeddings:
+    """
+    사용 가능한 장치에 맞춰 HuggingFace 임베딩 모델 생성
+
+    Args:
+        model_name: 사용할 임베딩 모델명
+        batch_size: 한 번에 인코딩할 문장 수
+        backend: 실행 백엔드 ("torch" 또는 "onnx")
+
+    Returns:
+        Embeddings: 정규화된 벡터를 반환하는 임베딩 모델
+    """
+    if backend == "onnx":
+        return ORTEmbeddings(model_name=model_name, batch_size=batch_size)
+
+    import torch
+
+    model_kwargs = {"device": "cpu"}
+    if torch.cuda.is_available():
+        # Ampere 이상 GPU에서 fp32 행렬곱을 TF32로 가속
+        torch.backends.cuda.matmul.allow_tf32 = True
+        model_kwargs = {
+            "device": "cuda",
+            "model_kwargs": {"torch_dtype": torch.float16},
+        }
+
+    return HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs=model_kwargs,
+        encode_kwargs={
+            "batch_size": batch_size,
+            "normalize_embeddings": True,
+            "convert_to_numpy": True,
+        },
+    )
+
+
+# 모델명/백엔드별 공유 임베딩 모델 (여러 스레드에서 동시에 모델을 불러오지 않도록 잠금)
+_shared_embeddings: Dict[Tuple[str, str], Embeddings] = {}
+_shared_embeddings_lock = threading.Lock()
+
+
+def get_hf_embeddings(
+    model_name: str = DEFAULT_EMBEDDING_MODEL,
+    backend: str = "torch",
+) -> Embeddings:
+    """
+    같은 모델/백엔드 조합에 대해 프로세스 전체에서 하나의 임베딩 모델을 공유
+    (모델 가중치를 매번 다시 불러오지 않음)
+
+    Args:
+        model_name: 사용할 임베딩 모델명
+        backend: 실행 백엔드 ("torch" 또는 "onnx")
+
+    Returns:
+        Embeddings: 공유 임베딩 모델
+    """
+    # 위치/키워드 인자나 기본값 사용 여부와 관계없이 같은 키로 조회
+    key = (model_name, backend)
+    embeddings = _shared_embeddings.get(key)
+    if embeddings is not None:
+        return embeddings
+
+    with _shared_embeddings_lock:
+        if key not in _shared_embeddings:
+            _shared_embeddings[key] = create_hf_embeddings(model_name, backend=backend)
+        return _shared_embeddings[key]
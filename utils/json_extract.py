@@ -0,0 +1,50 @@
+"""
+LLM 응답 텍스트에서 JSON 객체를 추출하는 유틸리티
+정규식 백트래킹 없이 한 번의 선형 스캔으로 첫 번째 JSON 객체 범위를 찾음
+"""
+
+from typing import Optional
+
+
+def extract_first_json(text: str) -> Optional[str]:
+    """
+    텍스트에서 괄호 균형이 맞는 첫 번째 JSON 객체 문자열을 반환
+
+    문자열 리터럴 내부의 괄호와 이스케이프 문자는 깊이 계산에서 제외합니다.
+
+    Args:
+        text: LLM 응답 등 JSON이 포함된 텍스트
+
+    Returns:
+        Optional[str]: JSON 객체 문자열 (찾지 못한 경우 None)
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escape = False
+
+    for i, ch in enumerate(text):
+        if depth == 0:
+            # 객체 바깥의 설명 텍스트는 여는 괄호만 확인
+            if ch == "{":
+                start = i
+                depth = 1
+            continue
+
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+
+    return None
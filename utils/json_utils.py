@@ -0,0 +1,61 @@
+"""
+JSON 직렬화 유틸리티
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json 모듈로 대체
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """
+    JSON 기본 타입이 아닌 값을 변환 (numpy 스칼라/배열, float·int 하위 클래스 등)
+    """
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, float):
+        return float(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    return str(obj)
+
+
+def dumps(obj: Any, indent: bool = True) -> str:
+    """
+    객체를 JSON 문자열로 변환 (한글 등 비ASCII 문자는 그대로 유지)
+
+    Args:
+        obj: 변환할 객체
+        indent: 2칸 들여쓰기 여부
+
+    Returns:
+        str: JSON 문자열
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option).decode()
+
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=_default)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    JSON 문자열을 파이썬 객체로 변환
+
+    Args:
+        data: JSON 문자열 또는 바이트
+
+    Returns:
+        Any: 변환된 객체
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
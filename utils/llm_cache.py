@@ -0,0 +1,160 @@
+"""
+LLM 응답 캐시 유틸리티
+temperature=0 호출처럼 같은 입력에 같은 결과를 내는 LLM 호출의 응답을 재사용
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+
+class CacheBackend(Protocol):
+    """캐시 저장소 인터페이스 (만료 시각과 값을 함께 저장)"""
+
+    def get(self, key: str) -> Optional[Tuple[Optional[float], Any]]:
+        ...
+
+    def set(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryCacheBackend:
+    """
+    프로세스 메모리에 저장하는 LRU 캐시
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Args:
+            max_size: 최대 저장 항목 수 (초과 시 가장 오래 사용되지 않은 항목 제거)
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Optional[float], Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class FileCacheBackend:
+    """
+    키별 JSON 파일로 저장하는 디스크 캐시 (프로세스 재시작 후에도 유지)
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        Args:
+            cache_dir: 캐시 파일 저장 경로
+        """
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[Optional[float], Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            return entry["expires_at"], entry["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # 임시 파일에 쓴 뒤 교체하여 중간에 읽히는 깨진 파일 방지
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": expires_at, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, self._path(key))
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+def make_cache_key(payload: Dict[str, Any]) -> str:
+    """
+    요청 내용을 정규화하여 SHA-256 캐시 키 생성
+
+    Args:
+        payload: 모델명, 프롬프트 등 응답을 결정하는 모든 입력
+
+    Returns:
+        str: 16진수 캐시 키
+    """
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    TTL과 적중률 통계를 지원하는 LLM 응답 캐시
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            backend: 캐시 저장소 (기본값: 메모리 LRU 캐시)
+            ttl: 기본 유효 시간(초), None이면 만료 없음
+        """
+        self.backend = backend or MemoryCacheBackend()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        캐시된 값을 조회 (없거나 만료된 경우 None)
+        """
+        entry = self.backend.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at is None or expires_at > time.time():
+                self.hits += 1
+                return value
+            self.backend.delete(key)
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        값을 캐시에 저장
+
+        Args:
+            key: 캐시 키
+            value: JSON 직렬화 가능한 값
+            ttl: 유효 시간(초), 지정하지 않으면 기본값 사용
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        self.backend.set(key, expires_at, value)
+
+    def stats(self) -> Dict[str, int]:
+        """캐시 적중/미적중 횟수 반환"""
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,10 +1,209 @@
 from utils.vector_db import VectorDBManager
 from utils.pdf_extractor import extract_text_and_tables
-from langchain_huggingface import HuggingFaceEmbeddings
+from utils import json_utils
+from utils.embeddings import CachedEmbeddings, get_hf_embeddings
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 import os
-from typing import List
+import hashlib
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from uuid import uuid4
 import json
 from datetime import datetime
+from tqdm import tqdm
+
+@lru_cache(maxsize=None)
+def _get_text_splitter(size: int, overlap: int) -> RecursiveCharacterTextSplitter:
+    """청크 설정별 텍스트 분할기를 한 번만 생성하여 재사용"""
+    return RecursiveCharacterTextSplitter(
+        chunk_size=size,
+        chunk_overlap=overlap,
+        separators=["\n\n", "\n", "。", ". ", " ", ""]
+    )
+
+# 텍스트를 청크로 나누는 헬퍼 함수 (문단/문장/단어 경계 우선)
+def split_text_into_chunks(text, size, overlap):
+    if not text:
+        return []
+    
+    return _get_text_splitter(size, overlap).split_text(text)
+
+
+@lru_cache(maxsize=4)
+def _get_embedder(model_name: str, backend: str, storage_dtype: str) -> CachedEmbeddings:
+    """모델별 임베딩(디스크 캐시 포함)을 한 번만 생성하여 여러 번의 호출에서 재사용"""
+    # 같은 청크는 재실행 시 다시 인코딩하지 않도록 디스크 캐시로 감쌈
+    return CachedEmbeddings(
+        get_hf_embeddings(model_name, backend),
+        model_name=model_name,
+        storage_dtype=storage_dtype
+    )
+
+
+def _file_hash(path: str) -> str:
+    """파일 내용의 SHA-256 해시 (변경 여부 판별용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _process_pdf(
+    db_manager: VectorDBManager,
+    collection_name: str,
+    pdf_file: str,
+    pdf_path: str,
+    pages_text: List[Dict],
+    tables: List[Dict],
+    chunk_size: int,
+    chunk_overlap: int
+) -> Tuple[str, Dict]:
+    """
+    추출된 PDF 텍스트와 테이블을 저장하고 VectorDB에 임베딩
+    
+    Returns:
+        (doc_id, 가이드라인 메타데이터 항목) 튜플
+    """
+    # 테이블 저장 (페이지 메타데이터의 table_ids가 파일명을 참조하므로 테이블별 파일 유지)
+    for i, table in enumerate(tables):
+        table_file = f"./outputs/tables/table_{i+1}_page_{table['page']}_{os.path.splitext(pdf_file)[0]}.json"
+        with open(table_file, "w", encoding="utf-8") as f:
+            f.write(json_utils.dumps(table))
+    
+    tqdm.write(f"테이블 추출 완료: {pdf_file} ({len(tables)}개 테이블 발견)")
+    
+    # 문서 정보 메타데이터 생성
+    doc_metadata = {
+        "source_type": "pdf",
+        "file_name": pdf_file,
+        "file_path": pdf_path,
+        "type": "guideline",
+        "timestamp": datetime.now().isoformat(),
+        "total_pages": len(pages_text),
+        "tables_count": len(tables)
+    }
+    
+    # 문서 특성에 따른 추가 메타데이터 설정
+    if "UNESCO" in pdf_file or "유네스코" in pdf_file:
+        doc_metadata["priority"] = 1
+        doc_metadata["organization"] = "UNESCO"
+    elif "OECD" in pdf_file:
+        doc_metadata["priority"] = 2
+        doc_metadata["organization"] = "OECD"
+    else:
+        doc_metadata["priority"] = 3
+        doc_metadata["organization"] = "기타"
+    
+    # 문서 단위 벡터는 검색에 쓰이지 않으므로 임베딩하지 않고 연결용 ID만 생성
+    summary = f"{pdf_file} 문서 요약: 총 {len(pages_text)}페이지, {len(tables)}개 테이블"
+    doc_id = f"pdf_{uuid4()}"
+    
+    # 페이지별 테이블과 table_ids 문자열을 한 번에 묶어 둠
+    tables_by_page = defaultdict(list)
+    for t in tables:
+        tables_by_page[int(t["page"])].append(t)
+    table_ids_by_page = {
+        page_num: ",".join(
+            f"table_{t['table_number']}_page_{t['page']}_{os.path.splitext(pdf_file)[0]}"
+            for t in page_tables
+        )
+        for page_num, page_tables in tables_by_page.items()
+    }
+    
+    # 각 페이지의 내용을 청크로 나누어 모은 뒤 VectorDB에 한 번에 추가
+    # (문서 공통 메타데이터는 한 번만 만들고 페이지/청크별 값만 덧붙임)
+    base_metadata = {**doc_metadata, "doc_id": doc_id}
+    contents = []
+    metadatas = []
+    # 페이지 진행률 표시 (청크 분할 결과는 진행 막대에 함께 표시)
+    page_bar = tqdm(pages_text, desc=pdf_file, leave=False)
+    for i, page in enumerate(page_bar):
+        page_num = i + 1
+        page_metadata = {**base_metadata, "page_number": page_num, "content_type": "page"}
+    
+        # 현재 페이지에 테이블이 있는지 확인
+        page_tables = tables_by_page.get(page_num)
+        if page_tables:
+            page_metadata["has_table"] = True
+            page_metadata["table_count"] = len(page_tables)
+            # 쉼표로 구분된 테이블 ID 문자열
+            page_metadata["table_ids"] = table_ids_by_page[page_num]
+    
+        # 페이지 텍스트를 청크로 나누기
+        page_text = page["text"]
+        if len(page_text) > chunk_size:
+            # 청크로 나누기
+            text_chunks = split_text_into_chunks(page_text, chunk_size, chunk_overlap)
+            page_bar.set_postfix(chunks=len(text_chunks))
+            total_chunks = len(text_chunks)
+    
+            for j, chunk in enumerate(text_chunks):
+                contents.append(chunk)
+                metadatas.append({
+                    **page_metadata,
+                    "chunk_index": j,
+                    "total_chunks": total_chunks,
+                    "content_type": "chunk"
+                })
+        else:
+            # 짧은 페이지는 그대로 추가
+            contents.append(page_text)
+            metadatas.append(page_metadata)
+    
+    # 페이지/청크 임베딩을 한 번에 계산한 뒤 Chroma에 직접 저장
+    embedding_function = db_manager.embedding_function
+    if isinstance(embedding_function, CachedEmbeddings):
+        # 디스크 캐시 래퍼가 배치 내 중복 텍스트를 이미 한 번만 인코딩함
+        embeddings = embedding_function.embed_documents(contents)
+    else:
+        # 캐시가 없는 임베딩은 머리글/바닥글처럼 반복되는 청크를 한 번만 임베딩한 뒤 원래 순서로 다시 배치
+        seen: Dict[str, int] = {}
+        unique_contents = []
+        positions = []
+        for content in contents:
+            if content not in seen:
+                seen[content] = len(unique_contents)
+                unique_contents.append(content)
+            positions.append(seen[content])
+        
+        unique_embeddings = embedding_function.embed_documents(unique_contents)
+        embeddings = [unique_embeddings[pos] for pos in positions]
+        if len(unique_contents) < len(contents):
+            tqdm.write(f"  중복 청크 {len(contents) - len(unique_contents)}개는 임베딩 재사용")
+    
+    db_manager.add_precomputed(
+        collection_name=collection_name,
+        ids=[str(uuid4()) for _ in contents],
+        embeddings=embeddings,
+        metadatas=metadatas,
+        documents=contents
+    )
+    
+    # 가이드라인 메타데이터 정보 생성
+    guideline_entry = {
+        "file_name": pdf_file,
+        "summary": summary,
+        "n_chunks": len(contents),
+        "organization": doc_metadata["organization"],
+        "priority": doc_metadata["priority"],
+        "tables": [t["page"] for t in tables]
+    }
+    
+    tqdm.write(f"성공: {pdf_file} ({len(pages_text)} 페이지, {len(contents)} 청크)")
+    
+    return doc_id, guideline_entry
+
+
+def _save_guideline_metadata(metadata_path: str, guideline_metadata: Dict) -> None:
+    """가이드라인 메타데이터를 outputs에 저장"""
+    os.makedirs(os.path.dirname(metadata_path), exist_ok=True)
+    with open(metadata_path, "w", encoding="utf-8") as f:
+        json.dump(guideline_metadata, f, ensure_ascii=False, indent=2)
+
 
 def embed_pdf_documents(
     collection_name: str = "ethics_guidelines", 
@@ -12,7 +211,9 @@ def embed_pdf_documents(
     use_huggingface: bool = True,
     embedding_model: str = "nlpai-lab/KURE-v1",
     chunk_size: int = 500,
-    chunk_overlap: int = 50
+    chunk_overlap: int = 50,
+    embedding_backend: str = "torch",
+    embedding_cache_dtype: str = "float16"
 ):
     """
     PDF 문서들을 임베딩하여 Vector DB에 저장
@@ -24,13 +225,12 @@ def embed_pdf_documents(
         embedding_model: 사용할 임베딩 모델명
         chunk_size: 청크 사이즈 (기본값 500자)
         chunk_overlap: 청크 오버랩 (기본값 50자)
+        embedding_backend: HuggingFace 모델 실행 백엔드 ("torch" 또는 "onnx")
+        embedding_cache_dtype: 임베딩 디스크 캐시 저장 정밀도 ("float16" 또는 "int8")
     """
     # 임베딩 모델 설정
     if use_huggingface:
-        embeddings = HuggingFaceEmbeddings(
-            model_name=embedding_model,
-            encode_kwargs={'normalize_embeddings': True}
-        )
+        embeddings = _get_embedder(embedding_model, embedding_backend, embedding_cache_dtype)
     else:
         embeddings = None  # 기본 OpenAI 임베딩 사용
     
@@ -39,146 +239,116 @@ def embed_pdf_documents(
     
     # data 디렉토리의 모든 PDF 파일 로드
     data_dir = "./data"
+    metadata_path = "./outputs/guideline_metadata.json"
     
+    # 파일명 -> 경로 (scandir 항목의 경로를 그대로 사용하고 .PDF 확장자도 포함)
     if specific_files:
-        pdf_files = specific_files
+        pdf_paths = {pdf_file: os.path.join(data_dir, pdf_file) for pdf_file in specific_files}
     else:
-        pdf_files = [f for f in os.listdir(data_dir) if f.endswith('.pdf')]
+        pdf_paths = {
+            entry.name: entry.path for entry in os.scandir(data_dir)
+            if entry.is_file() and entry.name.lower().endswith('.pdf')
+        }
     
+    # 기존 메타데이터를 불러와 이미 임베딩된 파일 내용(해시)은 건너뜀
     guideline_metadata = {}
-    os.makedirs("./outputs/tables", exist_ok=True)
+    if os.path.exists(metadata_path):
+        try:
+            with open(metadata_path, "r", encoding="utf-8") as f:
+                guideline_metadata = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"기존 메타데이터 로드 실패, 새로 작성합니다: {e}")
     
-    # 텍스트를 청크로 나누는 헬퍼 함수
-    def split_text_into_chunks(text, size, overlap):
-        if not text:
-            return []
-        
-        # 지정된 크기로 텍스트 분할 (오버랩 포함)
-        chunks = []
-        for i in range(0, len(text), size - overlap):
-            chunk = text[i:i + size]
-            if chunk:  # 빈 청크는 추가하지 않음
-                chunks.append(chunk)
+    # 파일명별 기존 메타데이터 항목
+    entries_by_file = defaultdict(list)
+    for entry in guideline_metadata.values():
+        entries_by_file[entry.get("file_name")].append(entry)
+    
+    file_hashes = {}
+    metadata_changed = False
+    for pdf_file, pdf_path in pdf_paths.items():
+        try:
+            file_hash = _file_hash(pdf_path)
+        except OSError as e:
+            print(f"오류 발생: {pdf_file} - {str(e)}")
+            continue
         
-        return chunks
+        # 호출자가 직접 지정한 파일은 항상 임베딩하고, 그 외에는 메타데이터와
+        # VectorDB에 실제로 청크가 남아 있는 경우에만 건너뜀
+        existing = entries_by_file.get(pdf_file, [])
+        if not specific_files and existing and db_manager.get_ids(
+            collection_name, {"file_name": pdf_file}, limit=1
+        ):
+            if all("file_hash" not in entry for entry in existing):
+                # 해시 기록 이전에 임베딩된 항목은 다시 임베딩하지 않고 현재 해시만 기록
+                for entry in existing:
+                    entry["file_hash"] = file_hash
+                metadata_changed = True
+                print(f"건너뜀 (해시 기록): {pdf_file}")
+                continue
+            if any(entry.get("file_hash") == file_hash for entry in existing):
+                print(f"건너뜀 (변경 없음): {pdf_file}")
+                continue
+        file_hashes[pdf_file] = file_hash
+    pdf_files = list(file_hashes)
+    
+    if not pdf_files:
+        if metadata_changed:
+            _save_guideline_metadata(metadata_path, guideline_metadata)
+        print("새로 임베딩할 PDF 문서가 없습니다.")
+        return guideline_metadata
+    
+    os.makedirs("./outputs/tables", exist_ok=True)
     
-    # 각 PDF 처리
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(data_dir, pdf_file)
-        print(f"처리 중: {pdf_file}")
+    # PDF 텍스트/테이블 추출은 CPU 작업이므로 프로세스 풀에서 병렬 수행하고,
+    # 임베딩과 VectorDB 저장은 추출이 끝난 파일부터 현재 프로세스에서 처리
+    max_workers = max(1, min(len(pdf_files), os.cpu_count() or 1))
+    # 호출 시점에 다른 스레드(서비스 분석, 백그라운드 저장, CUDA 런타임 등)가 살아 있으므로
+    # fork 대신 spawn으로 워커를 시작하여 상속된 잠금으로 인한 교착 방지
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        futures = {
+            executor.submit(extract_text_and_tables, pdf_paths[pdf_file]): pdf_file
+            for pdf_file in pdf_files
+        }
         
-        try:
-            # 텍스트와 테이블 모두 추출 (pdf_extracter 모듈 사용)
-            pages_text, tables = extract_text_and_tables(pdf_path)
-            
-            # 테이블 저장
-            for i, table in enumerate(tables):
-                table_file = f"./outputs/tables/table_{i+1}_page_{table['page']}_{pdf_file.replace('.pdf', '')}.json"
-                with open(table_file, "w", encoding="utf-8") as f:
-                    json.dump(table, f, ensure_ascii=False, indent=2)
-            
-            print(f"테이블 추출 완료: {len(tables)}개 테이블 발견")
-            
-            # 문서 정보 메타데이터 생성
-            doc_metadata = {
-                "source_type": "pdf",
-                "file_name": pdf_file,
-                "file_path": pdf_path,
-                "type": "guideline",
-                "timestamp": datetime.now().isoformat(),
-                "total_pages": len(pages_text),
-                "tables_count": len(tables)
-            }
+        # 각 PDF 처리 (추출 완료 순서)
+        for future in tqdm(as_completed(futures), total=len(futures), desc="PDFs"):
+            pdf_file = futures[future]
+            pdf_path = pdf_paths[pdf_file]
             
-            # 문서 특성에 따른 추가 메타데이터 설정
-            if "UNESCO" in pdf_file or "유네스코" in pdf_file:
-                doc_metadata["priority"] = 1
-                doc_metadata["organization"] = "UNESCO"
-            elif "OECD" in pdf_file:
-                doc_metadata["priority"] = 2
-                doc_metadata["organization"] = "OECD"
-            else:
-                doc_metadata["priority"] = 3
-                doc_metadata["organization"] = "기타"
-            
-            # 문서 요약 정보만 저장 (메타데이터와 함께) - 전체 문서 대신
-            summary = f"{pdf_file} 문서 요약: 총 {len(pages_text)}페이지, {len(tables)}개 테이블"
-            doc_id = db_manager.add_document(
-                collection_name=collection_name,
-                content=summary,
-                metadata=doc_metadata
-            )[0]
-            
-            # 각 페이지의 내용을 청크로 나누어 VectorDB에 추가
-            chunk_ids = []
-            for i, page in enumerate(pages_text):
-                # 메타데이터 업데이트
-                page_metadata = doc_metadata.copy()
-                page_num = i + 1
-                page_metadata.update({
-                    "page_number": page_num,
-                    "doc_id": doc_id,
-                    "content_type": "page"
-                })
+            try:
+                # 텍스트와 테이블 모두 추출 (pdf_extracter 모듈 사용)
+                pages_text, tables = future.result()
                 
-                # 현재 페이지에 테이블이 있는지 확인
-                page_tables = [t for t in tables if int(t["page"]) == page_num]
-                if page_tables:
-                    page_metadata["has_table"] = True
-                    page_metadata["table_count"] = len(page_tables)
-                    # 리스트를 쉼표로 구분된 문자열로 변환
-                    page_metadata["table_ids"] = ",".join([f"table_{t['table_number']}_page_{t['page']}_{pdf_file.replace('.pdf', '')}" for t in page_tables])
+                # 이전에 저장된 청크 ID (새 청크 저장이 성공한 뒤에만 삭제)
+                old_chunk_ids = db_manager.get_ids(collection_name, {"file_name": pdf_file})
                 
-                # 페이지 텍스트를 청크로 나누기
-                page_text = page["text"]
-                if len(page_text) > chunk_size:
-                    # 청크로 나누기
-                    text_chunks = split_text_into_chunks(page_text, chunk_size, chunk_overlap)
-                    print(f"  페이지 {page_num}: 텍스트를 {len(text_chunks)}개 청크로 분할")
-                    
-                    for j, chunk in enumerate(text_chunks):
-                        # 각 청크에 대한 메타데이터 추가
-                        chunk_metadata = page_metadata.copy()
-                        chunk_metadata.update({
-                            "chunk_index": j,
-                            "total_chunks": len(text_chunks),
-                            "content_type": "chunk"
-                        })
-                        
-                        # 청크를 VectorDB에 추가
-                        chunk_id = db_manager.add_document(
-                            collection_name=collection_name,
-                            content=chunk,
-                            metadata=chunk_metadata
-                        )[0]
-                        chunk_ids.append(chunk_id)
-                else:
-                    # 짧은 페이지는 그대로 추가
-                    page_id = db_manager.add_document(
-                        collection_name=collection_name,
-                        content=page_text,
-                        metadata=page_metadata
-                    )[0]
-                    chunk_ids.append(page_id)
-            
-            # 가이드라인 메타데이터 정보 저장
-            guideline_metadata[doc_id] = {
-                "file_name": pdf_file,
-                "chunk_ids": chunk_ids,
-                "organization": doc_metadata["organization"],
-                "priority": doc_metadata["priority"],
-                "tables": [t["page"] for t in tables]
-            }
-            
-            print(f"성공: {pdf_file} ({len(pages_text)} 페이지, {len(chunk_ids)} 청크)")
-            
-        except Exception as e:
-            print(f"오류 발생: {pdf_file} - {str(e)}")
+                doc_id, guideline_entry = _process_pdf(
+                    db_manager, collection_name, pdf_file, pdf_path,
+                    pages_text, tables, chunk_size, chunk_overlap
+                )
+                
+                # 새 청크가 저장되었으므로 이전 청크와 메타데이터 항목 제거
+                if old_chunk_ids:
+                    db_manager.delete_documents(collection_name, ids=old_chunk_ids)
+                    tqdm.write(f"이전 임베딩 삭제: {pdf_file} ({len(old_chunk_ids)}개 청크)")
+                for old_doc_id in [
+                    old_id for old_id, entry in guideline_metadata.items()
+                    if entry.get("file_name") == pdf_file
+                ]:
+                    del guideline_metadata[old_doc_id]
+                
+                guideline_entry["file_hash"] = file_hashes[pdf_file]
+                guideline_metadata[doc_id] = guideline_entry
+                
+            except Exception as e:
+                tqdm.write(f"오류 발생: {pdf_file} - {str(e)}")
     
     # 가이드라인 메타데이터 정보를 outputs에 저장
-    os.makedirs("./outputs", exist_ok=True)
-    with open("./outputs/guideline_metadata.json", "w", encoding="utf-8") as f:
-        json.dump(guideline_metadata, f, ensure_ascii=False, indent=2)
+    _save_guideline_metadata(metadata_path, guideline_metadata)
     
     print("모든 PDF 문서의 임베딩이 완료되었습니다.")
     return guideline_metadata
@@ -1,8 +1,13 @@
 import camelot
 import fitz  # PyMuPDF
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Tuple
 
+# 텍스트 정리용 정규식 (페이지마다 다시 파싱하지 않도록 미리 컴파일)
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+_PAGE_NUMBER_PATTERN = re.compile(r'- \d+ -')
+
 def extract_tables_from_pdf(pdf_path: str, page_range: str = 'all') -> List[Dict[str, Any]]:
     """
     PDF에서 테이블 추출하는 함수
@@ -27,7 +32,7 @@ def extract_tables_from_pdf(pdf_path: str, page_range: str = 'all') -> List[Dict
         for i, table in enumerate(tables):
             table_data = {
                 "page": table.parsing_report['page'],
-                "accuracy": table.parsing_report['accuracy'],
+                "accuracy": float(table.parsing_report['accuracy']),
                 "rows": table.df.shape[0],
                 "columns": table.df.shape[1],
                 "data": table.df.to_dict('records'),
@@ -42,63 +47,56 @@ def extract_tables_from_pdf(pdf_path: str, page_range: str = 'all') -> List[Dict
 
 def clean_text(text: str) -> str:
     """추출된 텍스트를 정리하는 함수"""
-    # 연속된 공백과 탭 제거
-    text = re.sub(r'\s+', ' ', text)
-    # 연속된 줄바꿈을 하나로 통합
-    text = re.sub(r'\n+', '\n', text)
-    # 줄 끝의 하이픈으로 나뉜 단어 결합 (영어 텍스트용)
-    text = re.sub(r'(\w+)-\n(\w+)', r'\1\2', text)
-    # 줄바꿈 근처의 공백 정리
-    text = re.sub(r' \n ', '\n', text)
+    # 연속된 공백, 탭, 줄바꿈을 공백 하나로 통합
+    # (줄바꿈이 모두 공백이 되므로 이후 줄바꿈/하이픈 결합 처리는 필요 없음)
+    text = _WHITESPACE_PATTERN.sub(' ', text)
     # 페이지 번호 패턴 정리 (예: "- 3 -")
-    text = re.sub(r'- \d+ -', '', text)
+    text = _PAGE_NUMBER_PATTERN.sub('', text)
     return text
 
-def extract_text_and_tables(pdf_path: str) -> Tuple[List[Dict], List[Dict]]:
+def extract_text_and_tables(pdf_path: str, layout_mode: str = "text") -> Tuple[List[Dict], List[Dict]]:
     """
     PDF에서 텍스트와 테이블을 모두 추출 (개선된 텍스트 추출)
     
     Args:
         pdf_path: PDF 파일 경로
+        layout_mode: 텍스트 추출 방식 ("text": 읽기 순서 정렬 텍스트, "blocks": 블록 단위 추출 후 정렬)
     
     Returns:
         텍스트 페이지 목록과 테이블 목록의 튜플
     """
     # 텍스트 추출
-    doc = fitz.open(pdf_path)
     pages_text = []
     
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        
-        # 방법 1: 블록 형식으로 텍스트 추출 (레이아웃 정보 포함)
-        blocks = page.get_text("blocks")
-        
-        # 블록을 y 좌표에 따라 정렬 (위에서 아래로)
-        blocks.sort(key=lambda b: b[1])  # y0 좌표로 정렬
-        
-        # 블록 텍스트 결합
-        page_text = ""
-        for block in blocks:
-            block_text = block[4]
-            if block_text.strip():
-                page_text += block_text + "\n"
+    # 테이블 추출은 가장 느린 단계이므로 문서 전체를 백그라운드 스레드 하나에서 실행하고,
+    # 그동안 텍스트 추출을 진행 (Camelot 이미지 백엔드는 스레드 안전하지 않아 한 번만 호출)
+    # (예외가 발생해도 PDF 파일 핸들이 닫히도록 컨텍스트 매니저 사용)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        tables_future = executor.submit(extract_tables_from_pdf, pdf_path)
         
-        # 텍스트 정리
-        page_text = clean_text(page_text)
+        with fitz.open(pdf_path) as doc:
+            for page_num, page in enumerate(doc):
+                if layout_mode == "blocks":
+                    # 블록 형식으로 텍스트 추출 후 y 좌표(y0)에 따라 위에서 아래로 정렬
+                    blocks = page.get_text("blocks")
+                    blocks.sort(key=lambda b: b[1])
+                    page_text = "".join(block[4] + "\n" for block in blocks if block[4].strip())
+                else:
+                    # PyMuPDF 레이아웃 엔진이 읽기 순서로 정렬한 텍스트를 그대로 사용
+                    page_text = page.get_text("text", sort=True)
+                
+                # 텍스트 정리
+                page_text = clean_text(page_text)
+                
+                # 또는 방법 2: HTML 형식으로 추출 후 처리도 고려할 수 있음
+                # html = page.get_text("html")
+                # 여기서 HTML 파싱 후 텍스트 추출 로직을 구현할 수 있음
+                
+                pages_text.append({
+                    "page": page_num + 1,
+                    "text": page_text
+                })
         
-        # 또는 방법 2: HTML 형식으로 추출 후 처리도 고려할 수 있음
-        # html = page.get_text("html")
-        # 여기서 HTML 파싱 후 텍스트 추출 로직을 구현할 수 있음
-        
-        pages_text.append({
-            "page": page_num + 1,
-            "text": page_text
-        })
-    
-    doc.close()
-    
-    # 테이블 추출
-    tables = extract_tables_from_pdf(pdf_path)
+        tables = tables_future.result()
     
-    return pages_text, tables
\ No newline at end of file
+    return pages_text, tables
@@ -5,32 +5,79 @@ ChromaDB를 이용한 벡터 데이터베이스 관리 유틸리티
 
 import os
 import json
-from typing import Dict, Any, List, Optional, Union
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
+import chromadb
 from langchain.schema import Document
 from langchain_chroma import Chroma
 from langchain_openai import OpenAIEmbeddings
 from langchain.embeddings.base import Embeddings
 from dotenv import load_dotenv
 
+from utils.llm_cache import MemoryCacheBackend, make_cache_key
+
 # .env 파일 로드
 load_dotenv()
 
+# 저장 경로별 chromadb 클라이언트 (LangChain 래퍼와 직접 쓰기가 같은 클라이언트를 공유)
+_clients: Dict[str, Any] = {}
+_clients_lock = threading.Lock()
+
+# Chroma 컬렉션 캐시 (저장 경로, 컬렉션 이름, 임베딩 함수 id) -> Chroma
+# 캐시된 Chroma가 임베딩 함수를 참조하므로 id가 다른 객체에 재사용되지 않음
+_collection_cache: Dict[Tuple[str, str, int], Chroma] = {}
+_collection_cache_lock = threading.Lock()  # 여러 스레드에서 동시에 컬렉션 생성 방지
+
+# 검색 결과 LRU 캐시 (키에 컬렉션 버전이 포함되어 쓰기 이후에는 이전 결과가 조회되지 않음)
+_search_cache = MemoryCacheBackend(max_size=1024)
+_collection_versions: Dict[Tuple[str, str], int] = {}
+_collection_versions_lock = threading.Lock()
+
+def _copy_documents(documents: List[Document]) -> List[Document]:
+    """캐시된 검색 결과를 호출자가 수정해도 캐시가 바뀌지 않도록 문서 복사본 반환"""
+    return [
+        Document(page_content=doc.page_content, metadata=dict(doc.metadata))
+        for doc in documents
+    ]
+
+def invalidate_search_cache(collection_name: str, persist_directory: str = "./vector_store") -> None:
+    """
+    VectorDBManager를 거치지 않고 컬렉션에 쓴 경우 해당 컬렉션의 검색 캐시 무효화
+    
+    Args:
+        collection_name: 컬렉션 이름
+        persist_directory: ChromaDB 데이터 저장 경로
+    """
+    key = (persist_directory, collection_name)
+    with _collection_versions_lock:
+        _collection_versions[key] = _collection_versions.get(key, 0) + 1
+
+def get_chroma_client(persist_directory: str = "./vector_store"):
+    """
+    저장 경로별 chromadb PersistentClient를 한 번만 생성하여 공유
+    
+    Args:
+        persist_directory: ChromaDB 데이터 저장 경로
+        
+    Returns:
+        chromadb.PersistentClient: 공유 클라이언트
+    """
+    client = _clients.get(persist_directory)
+    if client is not None:
+        return client
+    
+    with _clients_lock:
+        if persist_directory not in _clients:
+            _clients[persist_directory] = chromadb.PersistentClient(path=persist_directory)
+        return _clients[persist_directory]
+
 class VectorDBManager:
     """
     ChromaDB 기반 벡터 데이터베이스 관리자
     에이전트들이 공통으로 사용할 수 있는 문서 저장 및 검색 기능 제공
     """
     
-    _instance = None
-    
-    # 싱글톤 패턴 구현 (선택사항)
-    def __new__(cls, *args, **kwargs):
-        if cls._instance is None:
-            cls._instance = super(VectorDBManager, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(
         self,
         persist_directory: str = "./vector_store",
@@ -45,34 +92,25 @@ class VectorDBManager:
             openai_api_key: OpenAI API 키
             embedding_function: 사용자 지정 임베딩 함수 (선택사항)
         """
-        # 이미 초기화된 경우 건너뜀 (싱글톤 패턴)
-        if hasattr(self, '_initialized') and self._initialized:
-            return
-        
         self.persist_directory = persist_directory
         self.openai_api_key = openai_api_key or os.environ.get("OPENAI_API_KEY")
-        self.collections = {}  # 컬렉션 캐싱
         
         # 저장 디렉토리 생성
         os.makedirs(self.persist_directory, exist_ok=True)
+        self.client = get_chroma_client(self.persist_directory)
         
         # 사용자가 임베딩 함수를 제공했으면 그것을 사용, 아니면 HuggingFace 모델 사용
         if embedding_function:
             self.embedding_function = embedding_function
         else:
             try:
-                from langchain_huggingface import HuggingFaceEmbeddings
-                self.embedding_function = HuggingFaceEmbeddings(
-                    model_name="nlpai-lab/KURE-v1",
-                    encode_kwargs={'normalize_embeddings': True}
-                )
+                from utils.embeddings import get_hf_embeddings
+                self.embedding_function = get_hf_embeddings()
             except:
                 # HuggingFace 모델을 불러올 수 없으면 OpenAI 임베딩 시도
                 self.embedding_function = OpenAIEmbeddings(
                     openai_api_key=self.openai_api_key
                 )
-        
-        self._initialized = True
     
     def get_collection(self, collection_name: str) -> Chroma:
         """
@@ -84,14 +122,43 @@ class VectorDBManager:
         Returns:
             Chroma: ChromaDB 컬렉션 객체
         """
-        if collection_name not in self.collections:
-            self.collections[collection_name] = Chroma(
-                collection_name=collection_name,
-                embedding_function=self.embedding_function,
-                persist_directory=self.persist_directory
-            )
+        # 같은 저장 경로/컬렉션/임베딩 함수 조합은 매니저 인스턴스와 관계없이 재사용
+        key = (self.persist_directory, collection_name, id(self.embedding_function))
+        collection = _collection_cache.get(key)
+        if collection is not None:
+            return collection
         
-        return self.collections[collection_name]
+        with _collection_cache_lock:
+            if key not in _collection_cache:
+                _collection_cache[key] = Chroma(
+                    client=self.client,
+                    collection_name=collection_name,
+                    embedding_function=self.embedding_function
+                )
+            
+            return _collection_cache[key]
+    
+    def _bump_version(self, collection_name: str) -> None:
+        """컬렉션 내용이 바뀌었음을 기록하여 해당 컬렉션의 검색 캐시 무효화"""
+        invalidate_search_cache(collection_name, self.persist_directory)
+    
+    def _search_cache_key(
+        self,
+        collection_name: str,
+        query: str,
+        k: int,
+        filter: Optional[Dict[str, Any]]
+    ) -> str:
+        """검색 조건과 컬렉션 버전으로 검색 캐시 키 생성"""
+        return make_cache_key({
+            "persist_directory": self.persist_directory,
+            "collection": collection_name,
+            "embedding": id(self.embedding_function),
+            "version": _collection_versions.get((self.persist_directory, collection_name), 0),
+            "query": query,
+            "k": k,
+            "filter": filter or None
+        })
     
     def add_document(
         self, 
@@ -134,7 +201,107 @@ class VectorDBManager:
         )]
         
         # 문서 추가 및 ID 반환
-        return collection.add_documents(documents)
+        doc_ids = collection.add_documents(documents)
+        self._bump_version(collection_name)
+        return doc_ids
+    
+    def add_documents(
+        self, 
+        collection_name: str, 
+        contents: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        batch_size: int = 64
+    ) -> List[str]:
+        """
+        여러 문서를 배치 단위로 컬렉션에 추가 (임베딩을 일괄 계산)
+        
+        Args:
+            collection_name: 컬렉션 이름
+            contents: 문서 내용 목록
+            metadatas: 문서별 메타데이터 목록 (선택사항)
+            ids: 문서 ID 목록 (선택사항, 같은 ID가 있으면 덮어씀)
+            batch_size: 한 번에 임베딩할 문서 수
+            
+        Returns:
+            List[str]: 입력 순서와 동일한 문서 ID 목록
+        """
+        if not contents:
+            return []
+        
+        collection = self.get_collection(collection_name)
+        
+        if metadatas is None:
+            metadatas = [{} for _ in contents]
+        
+        timestamp = datetime.now().isoformat()
+        documents = []
+        for content, metadata in zip(contents, metadatas):
+            if "timestamp" not in metadata:
+                metadata["timestamp"] = timestamp
+            documents.append(Document(page_content=content, metadata=metadata))
+        
+        # 길이가 비슷한 문서끼리 같은 배치에 묶어 패딩 낭비를 줄이고, 반환 ID는 입력 순서로 복원
+        order = sorted(range(len(documents)), key=lambda i: len(documents[i].page_content), reverse=True)
+        result_ids = [None] * len(documents)
+        
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            batch_ids = collection.add_documents(
+                [documents[i] for i in batch],
+                ids=[ids[i] for i in batch] if ids is not None else None
+            )
+            for i, doc_id in zip(batch, batch_ids):
+                result_ids[i] = doc_id
+        
+        self._bump_version(collection_name)
+        return result_ids
+    
+    def add_precomputed(
+        self,
+        collection_name: str,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+        documents: List[str],
+        batch_size: int = 1000
+    ) -> List[str]:
+        """
+        미리 계산한 임베딩으로 문서를 저장 (임베딩 모델을 다시 호출하지 않고 Chroma에 직접 upsert)
+        
+        Args:
+            collection_name: 컬렉션 이름
+            ids: 문서 ID 목록 (같은 ID가 있으면 덮어씀)
+            embeddings: 문서별 임베딩 벡터 목록
+            metadatas: 문서별 메타데이터 목록
+            documents: 문서 내용 목록
+            batch_size: 한 번의 upsert로 저장할 문서 수 (Chroma 최대 배치 크기 이하)
+            
+        Returns:
+            List[str]: 저장한 문서 ID 목록
+        """
+        if not ids:
+            return []
+        
+        # 임베딩은 이미 계산되어 있으므로 임베딩 함수 없이 chromadb 컬렉션에 직접 저장
+        collection = self.client.get_or_create_collection(name=collection_name, embedding_function=None)
+        
+        timestamp = datetime.now().isoformat()
+        for metadata in metadatas:
+            if "timestamp" not in metadata:
+                metadata["timestamp"] = timestamp
+        
+        for start in range(0, len(ids), batch_size):
+            end = start + batch_size
+            collection.upsert(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                metadatas=metadatas[start:end],
+                documents=documents[start:end]
+            )
+        
+        self._bump_version(collection_name)
+        return list(ids)
     
     def search(
         self, 
@@ -155,12 +322,68 @@ class VectorDBManager:
         Returns:
             List[Document]: 검색된 문서 목록
         """
+        # 같은 조건의 검색은 임베딩과 Chroma 조회 없이 캐시된 결과 반환
+        cache_key = self._search_cache_key(collection_name, query, k, filter)
+        entry = _search_cache.get(cache_key)
+        if entry is not None:
+            return _copy_documents(entry[1])
+        
         collection = self.get_collection(collection_name)
         
         if filter:
-            return collection.similarity_search(query, k=k, filter=filter)
+            results = collection.similarity_search(query, k=k, filter=filter)
         else:
-            return collection.similarity_search(query, k=k)
+            results = collection.similarity_search(query, k=k)
+        
+        _search_cache.set(cache_key, None, results)
+        return _copy_documents(results)
+    
+    def search_batch(
+        self, 
+        collection_name: str, 
+        queries: List[str], 
+        k: int = 3,
+        filter: Optional[Dict[str, Any]] = None
+    ) -> List[List[Document]]:
+        """
+        여러 쿼리를 한 번에 검색 (캐시된 쿼리는 임베딩과 조회 생략)
+        
+        Args:
+            collection_name: 컬렉션 이름
+            queries: 검색 쿼리 목록
+            k: 쿼리별 반환할 최대 문서 수
+            filter: 필터링 조건 (선택사항)
+            
+        Returns:
+            List[List[Document]]: 쿼리 순서와 동일한 검색 결과 목록
+        """
+        if not queries:
+            return []
+        
+        # 캐시된 쿼리는 바로 채우고 나머지만 검색
+        cache_keys = [self._search_cache_key(collection_name, query, k, filter) for query in queries]
+        results: List[Optional[List[Document]]] = [None] * len(queries)
+        missing = []
+        for i, cache_key in enumerate(cache_keys):
+            entry = _search_cache.get(cache_key)
+            if entry is not None:
+                results[i] = _copy_documents(entry[1])
+            else:
+                missing.append(i)
+        
+        if missing:
+            collection = self.get_collection(collection_name)
+            
+            # search()와 같은 결과가 나오도록 쿼리용 인코딩으로, 캐시에 없는 쿼리를 한 번에 임베딩
+            from utils.embeddings import embed_queries
+            query_embeddings = embed_queries(self.embedding_function, [queries[i] for i in missing])
+            
+            for i, embedding in zip(missing, query_embeddings):
+                docs = collection.similarity_search_by_vector(embedding, k=k, filter=filter)
+                _search_cache.set(cache_keys[i], None, docs)
+                results[i] = _copy_documents(docs)
+        
+        return results
     
     def get_by_metadata(
         self, 
@@ -182,6 +405,26 @@ class VectorDBManager:
         collection = self.get_collection(collection_name)
         return collection.get(where=metadata_filter, limit=limit)
     
+    def get_ids(
+        self,
+        collection_name: str,
+        metadata_filter: Dict[str, Any],
+        limit: Optional[int] = None
+    ) -> List[str]:
+        """
+        메타데이터 조건에 맞는 문서 ID만 조회 (내용/임베딩은 불러오지 않음)
+        
+        Args:
+            collection_name: 컬렉션 이름
+            metadata_filter: 메타데이터 필터 조건
+            limit: 최대 결과 수 (None이면 전체)
+            
+        Returns:
+            List[str]: 문서 ID 목록
+        """
+        collection = self.get_collection(collection_name)
+        return collection.get(where=metadata_filter, limit=limit, include=[])["ids"]
+    
     def delete_documents(
         self, 
         collection_name: str, 
@@ -202,6 +445,7 @@ class VectorDBManager:
             collection.delete(ids=ids)
         elif filter is not None:
             collection.delete(where=filter)
+        self._bump_version(collection_name)
     
     def collection_exists(self, collection_name: str) -> bool:
         """
@@ -218,4 +462,22 @@ class VectorDBManager:
             self.get_collection(collection_name)
             return True
         except Exception:
-            return False
\ No newline at end of file
+            return False
+
+
+_manager: Optional[VectorDBManager] = None
+_manager_lock = threading.Lock()
+
+def get_manager() -> VectorDBManager:
+    """
+    프로세스 전체에서 공유하는 VectorDB 관리자 반환 (최초 호출 시 한 번만 생성)
+    
+    Returns:
+        VectorDBManager: 공유 VectorDB 관리자
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = VectorDBManager()
+    return _manager